@@ -107,7 +107,7 @@ class MasteryLevel(str, Enum):
 # Data classes
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class TopicAssessment:
     """Tracks the adaptive state for a single topic during a diagnostic."""
 
@@ -175,7 +175,7 @@ class TopicAssessment:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class DiagnosticSession:
     """Full state of an in-progress or completed diagnostic assessment."""
 
@@ -245,7 +245,7 @@ class DiagnosticSession:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class PlacementResult:
     """Final output of a completed diagnostic assessment."""
 
@@ -572,7 +572,15 @@ class DiagnosticService:
         assessment = session.topic_assessments[topic]
 
         # ---- Determine correctness ----
-        is_correct = self._check_answer(session, question_id, answer)
+        # In normal flow the answered question is the current one, so take
+        # the fast path and only fall back to the lookup on unexpected IDs.
+        question = session.current_question
+        if question is not None and question.question_id == question_id:
+            is_correct = self._check_current_answer(session, answer)
+            correct_answer = question.correct_answer
+        else:
+            is_correct = self._check_answer(session, question_id, answer)
+            correct_answer = self._get_correct_answer(session, question_id)
 
         # ---- Update assessment state ----
         assessment.questions_asked += 1
@@ -608,7 +616,7 @@ class DiagnosticService:
 
         return {
             "is_correct": is_correct,
-            "correct_answer": self._get_correct_answer(session, question_id),
+            "correct_answer": correct_answer,
             "topic": topic.value,
             "topic_assessment": assessment.to_dict(),
             "total_questions_asked": session.total_questions_asked,
@@ -981,6 +989,21 @@ class DiagnosticService:
         )
         return False
 
+    def _check_current_answer(
+        self,
+        session: DiagnosticSession,
+        answer: Any,
+    ) -> bool:
+        """
+        Compare the student's answer against the session's current question.
+
+        Callers must ensure ``session.current_question`` is the question
+        being answered; use _check_answer when that is not guaranteed.
+        """
+        return self._answers_match(
+            answer, session.current_question.correct_answer,
+        )
+
     @staticmethod
     def _answers_match(user_answer: Any, correct_answer: Any) -> bool:
         """
@@ -988,8 +1011,8 @@ class DiagnosticService:
 
         Handles int/float coercion and basic string normalization.
         """
-        # Exact match shortcut.
-        if user_answer == correct_answer:
+        # Exact match shortcut (identity first: O(1) for shared objects).
+        if user_answer is correct_answer or user_answer == correct_answer:
             return True
 
         # Numeric comparison with tolerance.
@@ -1034,17 +1057,24 @@ class DiagnosticService:
         self,
         session: DiagnosticSession,
     ) -> PlacementResult:
-        """Assemble a PlacementResult from the current session state."""
+        """
+        Assemble a PlacementResult from the current session state.
+
+        Aggregates and focus-topic candidates are gathered in a single pass
+        over the topic assessments.
+        """
         total_q = 0
         total_c = 0
         mastery_sum = 0.0
         assessed_count = 0
 
         recommended: Dict[str, float] = {}
-        topic_results: Dict[QuestionType, TopicAssessment] = {}
+        topic_results: Dict[QuestionType, TopicAssessment] = dict(
+            session.topic_assessments,
+        )
+        focus: List[Tuple[str, float]] = []
 
-        for qt, assessment in session.topic_assessments.items():
-            topic_results[qt] = assessment
+        for qt, assessment in topic_results.items():
             total_q += assessment.questions_asked
             total_c += assessment.questions_correct
             recommended[qt.value] = round(assessment.recommended_difficulty, 3)
@@ -1052,6 +1082,7 @@ class DiagnosticService:
             if assessment.questions_asked > 0:
                 mastery_sum += assessment.mastery_score
                 assessed_count += 1
+                focus.append((qt.value, assessment.mastery_score))
 
         overall_mastery = (
             mastery_sum / assessed_count if assessed_count > 0 else 0.0
@@ -1059,15 +1090,8 @@ class DiagnosticService:
         overall_accuracy = total_c / total_q if total_q > 0 else 0.0
 
         # Focus topics: lowest mastery first, limited to assessed topics.
-        focus = sorted(
-            [
-                (qt, a.mastery_score)
-                for qt, a in session.topic_assessments.items()
-                if a.questions_asked > 0
-            ],
-            key=lambda pair: pair[1],
-        )
-        focus_topics = [qt.value for qt, _ in focus if _ < 0.60]
+        focus.sort(key=lambda pair: pair[1])
+        focus_topics = [topic for topic, score in focus if score < 0.60]
 
         return PlacementResult(
             session_id=session.session_id,
@@ -14,13 +14,22 @@ Services:
 
 from __future__ import annotations
 
+import bisect
+import heapq
+import itertools
 import uuid
 import math
-import statistics
+import operator
+import sys
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+
+# Hizali cevap listesinden (dogru, yanlis, bos, konu puanlari) ureten fonksiyon
+_Grader = Callable[[List[Optional[Any]]], Tuple[int, int, int, Dict[str, float]]]
 
 
 # ---------------------------------------------------------------------------
@@ -50,7 +59,7 @@ class HomeworkStatus(Enum):
 # Data Classes
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class Homework:
     """Odev bilgisi."""
     homework_id: str
@@ -68,7 +77,7 @@ class Homework:
     toplam_ogrenci: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class HomeworkSubmission:
     """Odev teslimi."""
     submission_id: str
@@ -85,7 +94,7 @@ class HomeworkSubmission:
     topic_scores: Dict[str, float] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class WeeklyReport:
     """Haftalik ilerleme raporu."""
     report_id: str
@@ -110,7 +119,7 @@ class WeeklyReport:
     goal_progress: List[Dict[str, Any]] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class LearningGoal:
     """Ogrenme hedefi."""
     goal_id: str
@@ -127,7 +136,7 @@ class LearningGoal:
     description: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class ClassAnalytics:
     """Sinif duzeyinde analiz verileri."""
     class_id: str
@@ -144,6 +153,57 @@ class ClassAnalytics:
     odev_teslim_orani: float = 0.0
 
 
+@dataclass(slots=True)
+class StudentAggregate:
+    """Ogrencinin tum aktivitelerinden turetilen toplamlar (sinif analizleri icin)."""
+    total_q: int = 0
+    correct: int = 0
+    minutes: int = 0
+    # konu kodu -> (aktivite basina dogruluk yuzdeleri toplami, aktivite sayisi)
+    topic_accuracy_sums: Dict[int, Tuple[float, int]] = field(default_factory=dict)
+    # konu kodu -> (soru, dogru) toplamlari
+    topic_totals: Dict[int, Tuple[int, int]] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class ActivityRecord:
+    """Ogrenci aktivite kaydi (append_activity girdisinden varsayilanlarla bir kez olusturulur)."""
+    topic: str = "Genel"
+    questions_answered: int = 0
+    correct_answers: int = 0
+    duration_minutes: int = 0
+    timestamp: Optional[datetime] = None
+    # Cevap basina bir bayt: 1 dogru, 0 degil (results listesinden ingest sirasinda)
+    results_correct: bytes = b""
+
+
+@dataclass(frozen=True, slots=True)
+class ClassSnapshot:
+    """Sinifin tek taramada cikarilan analiz verisi (ClassAnalyticsService uc noktalari icin)."""
+    n_students: int
+    sum_acc: float
+    sum_q: int
+    sum_min: int
+    # _DISTRIBUTION_BANDS sirasinda ogrenci sayilari
+    band_counts: Tuple[int, ...]
+    # topic -> (aktivite basina dogruluk toplami, aktivite sayisi)
+    topic_accuracy: Dict[str, Tuple[float, int]]
+    # topic -> (soru, dogru, katilan ogrenci), ilk gorulme sirasiyla
+    topic_totals: Dict[str, Tuple[int, int, int]]
+    # (student_id, dogruluk, haftalik soru, aktif gun, risk faktorleri), risk sirasiyla
+    risk_records: Tuple[Tuple[str, float, int, int, Tuple[str, ...]], ...]
+
+
+@dataclass(slots=True)
+class RollingAggregates:
+    """Ogrencinin son 7 gunluk aktivite toplamlari (aktivite yaziminda guncellenir)."""
+    questions: int = 0
+    correct: int = 0
+    minutes: int = 0
+    # (timestamp, questions, correct, minutes) - zaman sirasina gore (insort ile)
+    window: Deque[Tuple[datetime, int, int, int]] = field(default_factory=deque)
+
+
 # ---------------------------------------------------------------------------
 # Simulated Data Store
 # ---------------------------------------------------------------------------
@@ -154,23 +214,169 @@ class _DataStore:
     In production this layer is replaced by PostgreSQL / MongoDB.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, counter_ids: bool = False) -> None:
+        # Kimlikler API'de gorunur: varsayilan uuid4. counter_ids=True yalnizca
+        # test/yerel depolar icindir (surec ici sayac; tahmin edilebilir, yeniden
+        # baslatmada ve isciler arasinda cakisir).
+        self._id_counter = itertools.count(1) if counter_ids else None
         self.homeworks: Dict[str, Homework] = {}
         self.submissions: Dict[str, HomeworkSubmission] = {}
+        # homework_id -> {student_id: submission}
+        self.submissions_by_hw: Dict[str, Dict[str, HomeworkSubmission]] = {}
+        # class_id -> [homework_id, ...] in creation order
+        self.homeworks_by_class: Dict[str, List[str]] = {}
+        # Turetilmis degerlendirme durumu; API'ye donen dataclass'larin disinda tutulur.
+        # homework_id -> {question_id: soru sirasi}
+        self.question_indexes: Dict[str, Dict[str, int]] = {}
+        # homework_id -> odeve ozel degerlendirme fonksiyonu (ilk degerlendirmede uretilir)
+        self.graders: Dict[str, _Grader] = {}
+        # submission_id -> Homework.questions ile hizali cevaplar (None = bos)
+        self.answer_lists: Dict[str, List[Optional[Any]]] = {}
         self.weekly_reports: Dict[str, WeeklyReport] = {}
+        # child_id -> raporlar ve hizali generated_at listesi (uretim sirasiyla)
+        self.reports_by_child: Dict[str, List[WeeklyReport]] = {}
+        self.report_times_by_child: Dict[str, List[datetime]] = {}
         self.learning_goals: Dict[str, LearningGoal] = {}
-        self.student_activity: Dict[str, List[Dict[str, Any]]] = {}
+        self.student_activity: Dict[str, List[ActivityRecord]] = {}
+        # Konu adi <-> kucuk tamsayi kod (analiz toplamlari koda gore tutulur)
+        self.topic_codes: Dict[str, int] = {}
+        self.topic_names: List[str] = []
+        # Zaman damgali kayitlar ve hizali damgalari, zaman sirasiyla (bisect icin).
+        # Zaman damgasi olmayan kayitlar yalnizca student_activity'de tutulur.
+        self.timed_activity: Dict[str, List[ActivityRecord]] = {}
+        self.activity_timestamps: Dict[str, List[datetime]] = {}
+        # student_id -> number of activity writes, used to invalidate caches
+        self.activity_version: Dict[str, int] = {}
+        self.rolling_aggregates: Dict[str, RollingAggregates] = {}
+        # student_id -> tum aktivitelerin toplamlari (aktivite yaziminda guncellenir)
+        self.student_aggregates: Dict[str, StudentAggregate] = {}
         self.class_rosters: Dict[str, List[str]] = {}
+        # student_id -> [class_id, ...] (class_rosters ters indeksi)
+        self.student_classes: Dict[str, List[str]] = {}
         self.question_bank: Dict[str, List[Dict[str, Any]]] = {}
         self.parent_children: Dict[str, List[str]] = {}
         self.parent_emails: Dict[str, str] = {}
 
-    def get_student_activity(self, student_id: str, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
-        """Ogrencinin aktivite kaydini dondurur."""
-        activities = self.student_activity.get(student_id, [])
-        if since:
-            activities = [a for a in activities if a.get("timestamp", datetime.min) >= since]
-        return activities
+    def next_id(self, prefix: str) -> str:
+        """Yeni kayit kimligi uretir (uuid4; counter_ids ile onekli sayac)."""
+        if self._id_counter is None:
+            return str(uuid.uuid4())
+        return f"{prefix}{next(self._id_counter):x}"
+
+    def append_activity(self, student_id: str, activity: Dict[str, Any]) -> None:
+        """
+        Ogrenciye yeni aktivite kaydi ekler (aktivite yazimlari buradan gecmeli).
+
+        Aktiviteler herhangi bir sirada gelebilir; zaman damgali kayitlar
+        zaman indeksine ve 7 gunluk pencereye sirasina gore yerlestirilir.
+        """
+        get = activity.get
+        topic = get("topic", "Genel")
+        if isinstance(topic, str):
+            # Ayni konu adlari tek nesneyi paylassin (daha hizli dict anahtari)
+            topic = self.topic_names[self.topic_code(topic)]
+        ts = get("timestamp")
+        if not isinstance(ts, datetime):
+            ts = None
+        q = get("questions_answered", 0)
+        c = get("correct_answers", 0)
+        m = get("duration_minutes", 0)
+        record = ActivityRecord(topic=topic, questions_answered=q, correct_answers=c,
+                                duration_minutes=m, timestamp=ts,
+                                results_correct=bytes(bool(r.get("correct")) for r in get("results", ())))
+        self.student_activity.setdefault(student_id, []).append(record)
+        agg = self.student_aggregates.get(student_id)
+        if agg is None:
+            agg = self.student_aggregates[student_id] = StudentAggregate()
+        self._fold_activity(agg, record)
+        self.activity_version[student_id] = self.activity_version.get(student_id, 0) + 1
+        if ts is not None:
+            timestamps = self.activity_timestamps.setdefault(student_id, [])
+            pos = bisect.bisect_right(timestamps, ts)
+            timestamps.insert(pos, ts)
+            self.timed_activity.setdefault(student_id, []).insert(pos, record)
+            agg = self.rolling_aggregates.setdefault(student_id, RollingAggregates())
+            bisect.insort(agg.window, (ts, q, c, m))
+            agg.questions += q
+            agg.correct += c
+            agg.minutes += m
+
+    def get_student_aggregate(self, student_id: str) -> StudentAggregate:
+        """Ogrencinin tum aktivitelerinin toplamlarini dondurur (salt okunur kullanilmali)."""
+        agg = self.student_aggregates.get(student_id)
+        return agg if agg is not None else StudentAggregate()
+
+    def recompute_student_aggregate(self, student_id: str) -> StudentAggregate:
+        """Toplamlari aktivite kaydindan bastan hesaplar (tutarlilik kontrolu icin)."""
+        agg = StudentAggregate()
+        for record in self.student_activity.get(student_id, []):
+            self._fold_activity(agg, record)
+        return agg
+
+    def _fold_activity(self, agg: StudentAggregate, record: ActivityRecord) -> None:
+        """Tek aktivitenin katkisini ogrenci toplamlarina ekler."""
+        code = self.topic_code(record.topic)
+        q = record.questions_answered
+        c = record.correct_answers
+        agg.total_q += q
+        agg.correct += c
+        agg.minutes += record.duration_minutes
+        if q > 0:
+            acc_sum, acc_n = agg.topic_accuracy_sums.get(code, (0.0, 0))
+            agg.topic_accuracy_sums[code] = (acc_sum + c / q * 100, acc_n + 1)
+        prev_q, prev_c = agg.topic_totals.get(code, (0, 0))
+        agg.topic_totals[code] = (prev_q + q, prev_c + c)
+
+    def topic_code(self, topic: str) -> int:
+        """Konu adinin kodunu dondurur; yeni konulara siradaki kodu atar."""
+        code = self.topic_codes.get(topic)
+        if code is None:
+            code = self.topic_codes[topic] = len(self.topic_names)
+            self.topic_names.append(sys.intern(topic))
+        return code
+
+    def get_rolling_aggregates(self, student_id: str, now: datetime) -> RollingAggregates:
+        """Son 7 gunun toplamlarini, pencereden cikan kayitlari dusurerek dondurur."""
+        agg = self.rolling_aggregates.get(student_id)
+        if agg is None:
+            return RollingAggregates()
+        week_ago = now - timedelta(days=7)
+        window = agg.window
+        while window and window[0][0] < week_ago:
+            _, q, c, m = window.popleft()
+            agg.questions -= q
+            agg.correct -= c
+            agg.minutes -= m
+        return agg
+
+    def get_student_activity(self, student_id: str, since: Optional[datetime] = None,
+                             until: Optional[datetime] = None) -> List[ActivityRecord]:
+        """
+        Ogrencinin [since, until) araligindaki aktivite kaydini dondurur.
+
+        Aralik verilmezse tum kayitlar eklenme sirasiyla doner; aralik
+        verilirse zaman damgasi olmayan kayitlar dahil edilmez.
+        """
+        if since is None and until is None:
+            return self.student_activity.get(student_id, [])
+        timestamps = self.activity_timestamps.get(student_id, [])
+        start = bisect.bisect_left(timestamps, since) if since else 0
+        end = bisect.bisect_left(timestamps, until) if until else len(timestamps)
+        return self.timed_activity.get(student_id, [])[start:end]
+
+    def add_student_to_class(self, class_id: str, student_id: str) -> None:
+        """Ogrenciyi sinif listesine ekler (sinif listesi yazimlari buradan gecmeli)."""
+        roster = self.class_rosters.setdefault(class_id, [])
+        if student_id in roster:
+            return
+        roster.append(student_id)
+        self.student_classes.setdefault(student_id, []).append(class_id)
+
+    def add_weekly_report(self, report: WeeklyReport) -> None:
+        """Haftalik raporu kaydeder ve cocuk bazli indekse ekler."""
+        self.weekly_reports[report.report_id] = report
+        self.reports_by_child.setdefault(report.child_id, []).append(report)
+        self.report_times_by_child.setdefault(report.child_id, []).append(report.generated_at)
 
     def get_class_students(self, class_id: str) -> List[str]:
         """Siniftaki ogrenci ID listesini dondurur."""
@@ -180,6 +386,10 @@ class _DataStore:
         """Placeholder - in production comes from user service."""
         return f"Ogrenci_{student_id[:6]}"
 
+    def get_student_names(self, student_ids: Iterable[str]) -> Dict[str, str]:
+        """Ogrenci adlarini tek toplu sorguyla dondurur (production: tek SELECT ... IN)."""
+        return {student_id: f"Ogrenci_{student_id[:6]}" for student_id in student_ids}
+
     def generate_questions_for_topics(self, topics: List[str], count: int) -> List[Dict[str, Any]]:
         """Konulara gore soru uretir (simulasyon)."""
         questions: List[Dict[str, Any]] = []
@@ -188,8 +398,8 @@ class _DataStore:
         for idx, topic in enumerate(topics):
             topic_count = per_topic + (1 if idx < remaining else 0)
             for q_idx in range(topic_count):
-                question_id = str(uuid.uuid4())
-                questions.append({"question_id": question_id, "topic": topic,
+                question_id = self.next_id("q-")
+                questions.append({"question_id": question_id, "q_idx": len(questions), "topic": topic,
                     "soru_metni": f"{topic} - Soru {q_idx + 1}",
                     "secenekler": ["A", "B", "C", "D"],
                     "dogru_cevap": "A", "zorluk": "orta",
@@ -203,6 +413,122 @@ class _DataStore:
 
 _store = _DataStore()
 
+# Haftalik rapor istatistiklerinin, yeni aktivite gelmese de yeniden
+# hesaplanmadan once en fazla ne kadar tekrar kullanilabilecegi.
+_REPORT_CACHE_TTL = timedelta(minutes=5)
+
+# get_homework_results icin teslim alanlari (tek attrgetter cagrisi)
+_SUBMISSION_FIELDS = operator.attrgetter(
+    "student_id", "score", "dogru_sayisi", "yanlis_sayisi", "bos_sayisi",
+    "submitted_at", "topic_scores")
+
+# Odev geri bildirimi: puan esikleri ve esiklerin arasindaki bantlarin metni
+_FEEDBACK_THRESHOLDS = (50, 70, 90)
+_FEEDBACK_BANDS = (
+    "Bu konularda daha fazla calisman gerekiyor.",
+    "Ortalama bir sonuc. Zayif konularina odaklanmani oneririm.",
+    "Iyi bir calisma, biraz daha pratik yaparak daha da iyilesebilirsin.",
+    "Harika bir performans! Tebrikler.",
+)
+
+# Sinif basari dagilimi: dogruluk esikleri ve esiklerin arasindaki bantlar
+_DISTRIBUTION_THRESHOLDS = (40, 55, 70, 85)
+_DISTRIBUTION_BANDS = ("cok_zayif", "zayif", "orta", "iyi", "cok_iyi")
+
+# Hic aktivitesi olmayan ogrencinin risk faktorleri (tum kontroller tutar)
+_NO_ACTIVITY_RISK_FACTORS = ("Dusuk dogruluk orani", "Az soru cozuyor",
+                             "Duzenli calismiyor", "Hic aktivite yok")
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _mean_min_max(values: List[float]) -> Tuple[float, float, float]:
+    """Ortalama, en kucuk ve en buyuk degeri tek geciste hesaplar (bos liste: 0.0)."""
+    if not values:
+        return 0.0, 0.0, 0.0
+    total = 0.0
+    lo = hi = values[0]
+    for v in values:
+        total += v
+        if v < lo:
+            lo = v
+        elif v > hi:
+            hi = v
+    return total / len(values), lo, hi
+
+
+def _max_streak(flags: bytes) -> int:
+    """
+    Bayt basina bir dogruluk bayragindan (0/1) en uzun ardisik dogru serisini dondurur.
+
+    Bayraklar tek tamsayi olarak okunur;
+    ``y_k`` = k uzunlugunda serilerin baslangic bitleri olmak uzere
+    ``y_(a+b) = y_a & (y_b >> 8a)``; once k ikiye katlanir, sonra kalan kisim
+    ikili aramayla eklenir (bayrak basina dongu yerine O(log seri) tamsayi islemi).
+    """
+    y = int.from_bytes(flags, "little")
+    if not y:
+        return 0
+    levels: List[Tuple[int, int]] = []
+    streak = 1
+    while True:
+        doubled = y & (y >> (8 * streak))
+        if not doubled:
+            break
+        levels.append((streak, y))
+        streak, y = streak * 2, doubled
+    for step, y_step in reversed(levels):
+        longer = y & (y_step >> (8 * streak))
+        if longer:
+            streak, y = streak + step, longer
+    return streak
+
+
+# -- Hedef degerlendiricileri (GoalType basina tek dal) --------------------
+
+def _eval_questions_per_week(store: _DataStore, goal: LearningGoal, now: datetime) -> float:
+    """Son 7 gunde cozulen soru sayisi (toplamlar aktivite yaziminda tutulur)."""
+    return float(store.get_rolling_aggregates(goal.child_id, now).questions)
+
+
+def _eval_accuracy(store: _DataStore, goal: LearningGoal, now: datetime) -> float:
+    """Son 7 gunluk dogruluk orani (%)."""
+    rolling = store.get_rolling_aggregates(goal.child_id, now)
+    total = rolling.questions
+    return round((rolling.correct / total) * 100, 2) if total > 0 else 0.0
+
+
+def _eval_practice_minutes(store: _DataStore, goal: LearningGoal, now: datetime) -> float:
+    """Son 7 gunluk calisma suresi (dk)."""
+    return float(store.get_rolling_aggregates(goal.child_id, now).minutes)
+
+
+def _eval_streak(store: _DataStore, goal: LearningGoal, now: datetime) -> float:
+    """Son 7 gundeki en uzun ardisik dogru serisi."""
+    recent = store.get_student_activity(goal.child_id, since=now - timedelta(days=7))
+    return float(_max_streak(b"".join(a.results_correct for a in recent)))
+
+
+def _eval_mastery(store: _DataStore, goal: LearningGoal, now: datetime) -> float:
+    """Tum aktivitelerdeki ortalama konu hakimiyeti (%)."""
+    total = 0
+    correct = 0
+    for a in store.get_student_activity(goal.child_id):
+        total += a.questions_answered
+        correct += a.correct_answers
+    return round((correct / total) * 100, 2) if total > 0 else 0.0
+
+
+_GOAL_EVALUATORS: Dict[GoalType, Callable[[_DataStore, LearningGoal, datetime], float]] = {
+    GoalType.QUESTIONS_PER_WEEK: _eval_questions_per_week,
+    GoalType.ACCURACY_TARGET: _eval_accuracy,
+    GoalType.STREAK_TARGET: _eval_streak,
+    GoalType.MASTERY_TARGET: _eval_mastery,
+    GoalType.PRACTICE_MINUTES: _eval_practice_minutes,
+}
+
 
 # ---------------------------------------------------------------------------
 # HomeworkService - Odev Yonetimi
@@ -225,40 +551,49 @@ class HomeworkService:
             raise ValueError("Soru sayisi pozitif olmalidir.")
         if not topics:
             raise ValueError("En az bir konu belirtilmelidir.")
-        if due_date <= datetime.utcnow():
+        now = datetime.utcnow()
+        if due_date <= now:
             raise ValueError("Son teslim tarihi gelecekte olmalidir.")
-        homework_id = str(uuid.uuid4())
+        topics = [sys.intern(t) for t in topics]
+        homework_id = self._store.next_id("hw-")
         questions = self._store.generate_questions_for_topics(topics, question_count)
         students = self._store.get_class_students(class_id)
         homework = Homework(homework_id=homework_id, teacher_id=teacher_id, class_id=class_id,
             title=title, topics=topics, question_count=question_count, questions=questions,
-            due_date=due_date, created_at=datetime.utcnow(), status=HomeworkStatus.ASSIGNED,
+            due_date=due_date, created_at=now, status=HomeworkStatus.ASSIGNED,
             toplam_ogrenci=len(students))
         self._store.homeworks[homework_id] = homework
+        self._store.question_indexes[homework_id] = {q["question_id"]: q["q_idx"] for q in questions}
+        self._store.homeworks_by_class.setdefault(class_id, []).append(homework_id)
         return homework
 
     def get_homework(self, homework_id: str) -> Homework:
         """Odev detaylarini getirir."""
-        if homework_id not in self._store.homeworks:
-            raise KeyError(f"Odev bulunamadi: {homework_id}")
-        homework = self._store.homeworks[homework_id]
-        self._refresh_homework_status(homework)
-        return homework
+        return self._get_homework(homework_id, datetime.utcnow())
 
     def submit_homework(self, homework_id: str, student_id: str, answers: List[Dict[str, Any]]) -> HomeworkSubmission:
         """Ogrenci odev teslimi yapar."""
-        homework = self.get_homework(homework_id)
+        now = datetime.utcnow()
+        homework = self._get_homework(homework_id, now)
         if homework.status == HomeworkStatus.CANCELLED:
             raise ValueError("Bu odev iptal edilmistir.")
-        if datetime.utcnow() > homework.due_date:
+        if now > homework.due_date:
             raise ValueError("Odev teslim suresi gecmistir.")
         existing = self._find_submission(homework_id, student_id)
         if existing is not None:
             raise ValueError("Bu odev zaten teslim edilmis.")
-        submission_id = str(uuid.uuid4())
+        answer_list: List[Optional[Any]] = [None] * len(homework.questions)
+        question_index = self._store.question_indexes[homework_id]
+        for a in answers:
+            q_idx = question_index.get(a["question_id"])
+            if q_idx is not None:
+                answer_list[q_idx] = a.get("answer")
+        submission_id = self._store.next_id("sub-")
         submission = HomeworkSubmission(submission_id=submission_id, homework_id=homework_id,
-            student_id=student_id, answers=answers, submitted_at=datetime.utcnow())
+            student_id=student_id, answers=answers, submitted_at=now)
         self._store.submissions[submission_id] = submission
+        self._store.answer_lists[submission_id] = answer_list
+        self._store.submissions_by_hw.setdefault(homework_id, {})[student_id] = submission
         homework.teslim_sayisi += 1
         if homework.status == HomeworkStatus.ASSIGNED:
             homework.status = HomeworkStatus.IN_PROGRESS
@@ -266,44 +601,47 @@ class HomeworkService:
 
     def grade_homework(self, homework_id: str) -> Dict[str, Any]:
         """Odeve ait tum teslimleri otomatik degerlendirir."""
-        homework = self.get_homework(homework_id)
+        now = datetime.utcnow()
+        homework = self._get_homework(homework_id, now)
         submissions = self._get_homework_submissions(homework_id)
         if not submissions:
             return {"homework_id": homework_id, "graded_count": 0,
                     "sinif_ortalamasi": 0.0, "en_yuksek_puan": 0.0,
                     "en_dusuk_puan": 0.0, "submissions": []}
-        scores: List[float] = []
-        for submission in submissions:
-            self._grade_single_submission(submission, homework)
-            if submission.score is not None:
-                scores.append(submission.score)
-        avg_score = statistics.mean(scores) if scores else 0.0
+        # Teslimler birbirinden bagimsiz degerlendirilir; yalnizca puanlar toplanir
+        grader = self._get_grader(homework)
+        scores = [self._grade_single_submission(s, grader, now) for s in submissions]
+        avg_score, min_score, max_score = _mean_min_max(scores)
         homework.sinif_ortalamasi = round(avg_score, 2)
         homework.status = HomeworkStatus.GRADED
         return {"homework_id": homework_id, "graded_count": len(submissions),
                 "sinif_ortalamasi": round(avg_score, 2),
-                "en_yuksek_puan": max(scores) if scores else 0.0,
-                "en_dusuk_puan": min(scores) if scores else 0.0,
+                "en_yuksek_puan": max_score,
+                "en_dusuk_puan": min_score,
                 "submissions": submissions}
 
     def get_homework_results(self, homework_id: str) -> Dict[str, Any]:
         """Ogretmen icin odev sonuclarini dondurur."""
         homework = self.get_homework(homework_id)
         submissions = self._get_homework_submissions(homework_id)
+        names = self._store.get_student_names(sub.student_id for sub in submissions)
         student_results: List[Dict[str, Any]] = []
         topic_totals: Dict[str, List[float]] = {}
         for sub in submissions:
-            student_results.append({"student_id": sub.student_id,
-                "student_name": self._store.get_student_name(sub.student_id),
-                "score": sub.score, "dogru_sayisi": sub.dogru_sayisi,
-                "yanlis_sayisi": sub.yanlis_sayisi, "bos_sayisi": sub.bos_sayisi,
-                "submitted_at": sub.submitted_at.isoformat(),
-                "topic_scores": sub.topic_scores})
-            for topic, score in sub.topic_scores.items():
-                topic_totals.setdefault(topic, []).append(score)
-        topic_analysis = [{"topic": t, "ortalama": round(statistics.mean(v), 2),
-             "en_dusuk": round(min(v), 2), "en_yuksek": round(max(v), 2)}
-            for t, v in topic_totals.items()]
+            student_id, score, dogru, yanlis, bos, submitted_at, topic_scores = _SUBMISSION_FIELDS(sub)
+            student_results.append({"student_id": student_id,
+                "student_name": names[student_id],
+                "score": score, "dogru_sayisi": dogru,
+                "yanlis_sayisi": yanlis, "bos_sayisi": bos,
+                "submitted_at": submitted_at.isoformat(),
+                "topic_scores": topic_scores})
+            for topic, topic_score in topic_scores.items():
+                topic_totals.setdefault(topic, []).append(topic_score)
+        topic_analysis: List[Dict[str, Any]] = []
+        for t, v in topic_totals.items():
+            ortalama, en_dusuk, en_yuksek = _mean_min_max(v)
+            topic_analysis.append({"topic": t, "ortalama": round(ortalama, 2),
+                "en_dusuk": round(en_dusuk, 2), "en_yuksek": round(en_yuksek, 2)})
         teslim_orani = (homework.teslim_sayisi / homework.toplam_ogrenci * 100
                         if homework.toplam_ogrenci > 0 else 0.0)
         return {"homework_id": homework_id, "title": homework.title,
@@ -314,91 +652,110 @@ class HomeworkService:
 
     def get_student_homework_list(self, student_id: str) -> Dict[str, List[Dict[str, Any]]]:
         """Ogrencinin bekleyen ve tamamlanan odevlerini listeler."""
+        now = datetime.utcnow()
         bekleyen: List[Dict[str, Any]] = []
         tamamlanan: List[Dict[str, Any]] = []
         suresi_gecmis: List[Dict[str, Any]] = []
-        for hw in self._store.homeworks.values():
-            class_students = self._store.get_class_students(hw.class_id)
-            if student_id not in class_students:
-                continue
-            submission = self._find_submission(hw.homework_id, student_id)
-            hw_info = {"homework_id": hw.homework_id, "title": hw.title,
-                "topics": hw.topics, "question_count": hw.question_count,
-                "due_date": hw.due_date.isoformat(), "status": hw.status.value}
-            if submission is not None:
-                hw_info["score"] = submission.score
-                hw_info["submitted_at"] = submission.submitted_at.isoformat()
-                tamamlanan.append(hw_info)
-            elif datetime.utcnow() > hw.due_date:
-                suresi_gecmis.append(hw_info)
-            else:
-                kalan = hw.due_date - datetime.utcnow()
-                hw_info["kalan_sure_saat"] = round(kalan.total_seconds() / 3600, 1)
-                bekleyen.append(hw_info)
+        for class_id in self._store.student_classes.get(student_id, ()):
+            for homework_id in self._store.homeworks_by_class.get(class_id, ()):
+                hw = self._store.homeworks[homework_id]
+                submission = self._find_submission(homework_id, student_id)
+                hw_info = {"homework_id": hw.homework_id, "title": hw.title,
+                    "topics": hw.topics, "question_count": hw.question_count,
+                    "due_date": hw.due_date.isoformat(), "status": hw.status.value}
+                if submission is not None:
+                    hw_info["score"] = submission.score
+                    hw_info["submitted_at"] = submission.submitted_at.isoformat()
+                    tamamlanan.append(hw_info)
+                    continue
+                kalan = (hw.due_date - now).total_seconds()
+                if kalan < 0:
+                    suresi_gecmis.append(hw_info)
+                else:
+                    hw_info["kalan_sure_saat"] = round(kalan / 3600, 1)
+                    bekleyen.append(hw_info)
         return {"bekleyen": bekleyen, "tamamlanan": tamamlanan, "suresi_gecmis": suresi_gecmis}
 
     # -- Private helpers ---------------------------------------------------
 
-    def _refresh_homework_status(self, homework: Homework) -> None:
+    def _get_homework(self, homework_id: str, now: datetime) -> Homework:
+        if homework_id not in self._store.homeworks:
+            raise KeyError(f"Odev bulunamadi: {homework_id}")
+        homework = self._store.homeworks[homework_id]
+        self._refresh_homework_status(homework, now)
+        return homework
+
+    def _refresh_homework_status(self, homework: Homework, now: datetime) -> None:
         if (homework.status in (HomeworkStatus.ASSIGNED, HomeworkStatus.IN_PROGRESS)
-                and datetime.utcnow() > homework.due_date):
+                and now > homework.due_date):
             homework.status = HomeworkStatus.OVERDUE
 
     def _find_submission(self, homework_id: str, student_id: str) -> Optional[HomeworkSubmission]:
-        for sub in self._store.submissions.values():
-            if sub.homework_id == homework_id and sub.student_id == student_id:
-                return sub
-        return None
+        return self._store.submissions_by_hw.get(homework_id, {}).get(student_id)
 
     def _get_homework_submissions(self, homework_id: str) -> List[HomeworkSubmission]:
-        return [s for s in self._store.submissions.values() if s.homework_id == homework_id]
-
-    def _grade_single_submission(self, submission: HomeworkSubmission, homework: Homework) -> None:
-        """Tek bir teslimi degerlendirir."""
-        answer_map = {a["question_id"]: a.get("answer") for a in submission.answers}
-        dogru, yanlis, bos = 0, 0, 0
-        topic_correct: Dict[str, int] = {}
-        topic_total: Dict[str, int] = {}
-        for q in homework.questions:
-            qid = q["question_id"]
-            topic = q["topic"]
-            topic_total[topic] = topic_total.get(topic, 0) + 1
-            student_answer = answer_map.get(qid)
-            if student_answer is None or student_answer == "":
-                bos += 1
-            elif student_answer == q["dogru_cevap"]:
-                dogru += 1
-                topic_correct[topic] = topic_correct.get(topic, 0) + 1
-            else:
-                yanlis += 1
-        total = len(homework.questions)
+        return list(self._store.submissions_by_hw.get(homework_id, {}).values())
+
+    def _get_grader(self, homework: Homework) -> _Grader:
+        """
+        Odeve ozel degerlendirme fonksiyonunu dondurur (ilk cagrida uretilir).
+
+        Cevap anahtari ve konu basina soru sayilari fonksiyona bir kez
+        baglanir; fonksiyon hizali cevap listesinden
+        (dogru, yanlis, bos, konu puanlari) dondurur.
+        """
+        grader = self._store.graders.get(homework.homework_id)
+        if grader is not None:
+            return grader
+        correct_answers = tuple(q["dogru_cevap"] for q in homework.questions)
+        topic_index: Dict[str, int] = {}
+        topic_ids = tuple(topic_index.setdefault(q["topic"], len(topic_index))
+                          for q in homework.questions)
+        topic_total = [0] * len(topic_index)
+        for tid in topic_ids:
+            topic_total[tid] += 1
+
+        def grade(answer_list: List[Optional[Any]]) -> Tuple[int, int, int, Dict[str, float]]:
+            dogru, yanlis, bos = 0, 0, 0
+            topic_correct = [0] * len(topic_total)
+            for expected, tid, student_answer in zip(correct_answers, topic_ids, answer_list):
+                if student_answer is None or student_answer == "":
+                    bos += 1
+                elif student_answer == expected:
+                    dogru += 1
+                    topic_correct[tid] += 1
+                else:
+                    yanlis += 1
+            topic_scores = {t: round((topic_correct[tid] / topic_total[tid]) * 100, 2)
+                            for t, tid in topic_index.items()}
+            return dogru, yanlis, bos, topic_scores
+
+        self._store.graders[homework.homework_id] = grade
+        return grade
+
+    def _grade_single_submission(self, submission: HomeworkSubmission,
+                                 grader: _Grader,
+                                 now: datetime) -> float:
+        """Tek bir teslimi degerlendirir ve puanini dondurur."""
+        dogru, yanlis, bos, topic_scores = grader(self._store.answer_lists[submission.submission_id])
+        total = dogru + yanlis + bos
         score = round((dogru / total) * 100, 2) if total > 0 else 0.0
-        topic_scores: Dict[str, float] = {}
-        for topic, total_q in topic_total.items():
-            correct_q = topic_correct.get(topic, 0)
-            topic_scores[topic] = round((correct_q / total_q) * 100, 2) if total_q > 0 else 0.0
         submission.score = score
         submission.dogru_sayisi = dogru
         submission.yanlis_sayisi = yanlis
         submission.bos_sayisi = bos
         submission.topic_scores = topic_scores
-        submission.graded_at = datetime.utcnow()
+        submission.graded_at = now
         submission.feedback = self._generate_feedback(score, topic_scores)
+        return score
 
     @staticmethod
     def _generate_feedback(score: float, topic_scores: Dict[str, float]) -> str:
         """Puana gore otomatik geri bildirim uretir."""
-        if score >= 90:
-            feedback = "Harika bir performans! Tebrikler."
-        elif score >= 70:
-            feedback = "Iyi bir calisma, biraz daha pratik yaparak daha da iyilesebilirsin."
-        elif score >= 50:
-            feedback = "Ortalama bir sonuc. Zayif konularina odaklanmani oneririm."
-        else:
-            feedback = "Bu konularda daha fazla calisman gerekiyor."
+        feedback = _FEEDBACK_BANDS[bisect.bisect_right(_FEEDBACK_THRESHOLDS, score)]
         weak_topics = [t for t, s in topic_scores.items() if s < 50]
         if weak_topics:
-            feedback += f" Ozellikle su konulara calis: {', '.join(weak_topics)}."
+            return f"{feedback} Ozellikle su konulara calis: {', '.join(weak_topics)}."
         return feedback
 
 
@@ -414,55 +771,23 @@ class WeeklyReportService:
 
     def __init__(self, store: Optional[_DataStore] = None) -> None:
         self._store = store or _store
+        # child_id -> (activity_version, computed_at, stats)
+        self._stats_cache: Dict[str, Tuple[int, datetime, Dict[str, Any]]] = {}
 
     def generate_weekly_report(self, child_id: str) -> WeeklyReport:
         """Son bir hafta icin kapsamli ilerleme raporu uretir."""
         now = datetime.utcnow()
         week_start = now - timedelta(days=7)
         week_end = now
-        activities = self._store.get_student_activity(child_id, since=week_start)
-        prev_week_start = week_start - timedelta(days=7)
-        prev_activities = self._store.get_student_activity(child_id, since=prev_week_start)
-        prev_activities = [a for a in prev_activities
-                           if a.get("timestamp", datetime.min) < week_start]
-
-        toplam_soru = self._count_questions(activities)
-        dogru_sayisi = self._count_correct(activities)
-        dogru_orani = round((dogru_sayisi / toplam_soru) * 100, 2) if toplam_soru > 0 else 0.0
-        calisma_suresi = self._total_minutes(activities)
-        aktif_gunler = self._active_days(activities)
-        en_uzun_seri = self._longest_streak(activities)
-
-        prev_soru = self._count_questions(prev_activities)
-        prev_dogru = self._count_correct(prev_activities)
-        prev_dogru_orani = round((prev_dogru / prev_soru) * 100, 2) if prev_soru > 0 else 0.0
-        prev_sure = self._total_minutes(prev_activities)
-
-        soru_degisim = self._percentage_change(prev_soru, toplam_soru)
-        dogruluk_degisim = round(dogru_orani - prev_dogru_orani, 2)
-        sure_degisim = self._percentage_change(prev_sure, calisma_suresi)
-
-        topic_stats = self._topic_breakdown(activities)
-        prev_topic_stats = self._topic_breakdown(prev_activities)
-        guclu = [t for t, s in topic_stats.items() if s >= 80]
-        zayif = [t for t, s in topic_stats.items() if s < 50]
-        gelisen = [t for t in topic_stats if t in prev_topic_stats and topic_stats[t] - prev_topic_stats[t] >= 10]
-        gerileyen = [t for t in topic_stats if t in prev_topic_stats and prev_topic_stats[t] - topic_stats[t] >= 10]
-        oneriler = self._generate_suggestions(dogru_orani, toplam_soru, calisma_suresi, aktif_gunler, zayif)
-        oncelikli = zayif[:3] if zayif else []
+        stats = self._weekly_stats(child_id, now)
         goal_progress = self._get_goal_progress(child_id)
 
-        report_id = str(uuid.uuid4())
+        report_id = self._store.next_id("rep-")
         report = WeeklyReport(report_id=report_id, child_id=child_id,
             week_start=week_start, week_end=week_end, generated_at=now,
-            toplam_soru=toplam_soru, dogru_orani=dogru_orani,
-            calisma_suresi_dakika=calisma_suresi, aktif_gun_sayisi=aktif_gunler,
-            en_uzun_seri=en_uzun_seri, guclu_konular=guclu, zayif_konular=zayif,
-            gelisen_konular=gelisen, gerileyen_konular=gerileyen,
-            soru_degisim_yuzdesi=soru_degisim, dogruluk_degisim=dogruluk_degisim,
-            sure_degisim_yuzdesi=sure_degisim, oneriler=oneriler,
-            oncelikli_konular=oncelikli, goal_progress=goal_progress)
-        self._store.weekly_reports[report_id] = report
+            goal_progress=goal_progress,
+            **{k: list(v) if isinstance(v, list) else v for k, v in stats.items()})
+        self._store.add_weekly_report(report)
         return report
 
     def send_email_report(self, parent_id: str, child_id: str) -> Dict[str, Any]:
@@ -476,9 +801,9 @@ class WeeklyReportService:
     def get_report_history(self, child_id: str, weeks: int = 12) -> List[Dict[str, Any]]:
         """Gecmis haftalik raporlarin ozetini dondurur."""
         cutoff = datetime.utcnow() - timedelta(weeks=weeks)
-        reports = [r for r in self._store.weekly_reports.values()
-                   if r.child_id == child_id and r.generated_at >= cutoff]
-        reports.sort(key=lambda r: r.week_start)
+        # Raporlar uretim sirasiyla eklenir; bu sira week_start sirasiyla aynidir
+        times = self._store.report_times_by_child.get(child_id, [])
+        reports = self._store.reports_by_child.get(child_id, [])[bisect.bisect_left(times, cutoff):]
         return [{"report_id": r.report_id,
                  "week_start": r.week_start.isoformat(),
                  "week_end": r.week_end.isoformat(),
@@ -491,52 +816,89 @@ class WeeklyReportService:
 
     # -- Private helpers ---------------------------------------------------
 
-    @staticmethod
-    def _count_questions(activities: List[Dict[str, Any]]) -> int:
-        return sum(a.get("questions_answered", 0) for a in activities)
+    def _weekly_stats(self, child_id: str, now: datetime) -> Dict[str, Any]:
+        """
+        Raporun aktivite verisinden turetilen alanlarini dondurur.
 
-    @staticmethod
-    def _count_correct(activities: List[Dict[str, Any]]) -> int:
-        return sum(a.get("correct_answers", 0) for a in activities)
+        Sonuc ogrencinin aktivite surumune gore onbellege alinir; yeni
+        aktivite eklenmedikce ve _REPORT_CACHE_TTL dolmadikca yeniden
+        hesaplanmaz. report_id ve hafta sinirlari onbellege girmez.
+        """
+        version = self._store.activity_version.get(child_id, 0)
+        cached = self._stats_cache.get(child_id)
+        if cached is not None and cached[0] == version and now - cached[1] < _REPORT_CACHE_TTL:
+            return cached[2]
 
-    @staticmethod
-    def _total_minutes(activities: List[Dict[str, Any]]) -> int:
-        return sum(a.get("duration_minutes", 0) for a in activities)
+        week_start = now - timedelta(days=7)
+        activities = self._store.get_student_activity(child_id, since=week_start)
+        prev_week_start = week_start - timedelta(days=7)
+        prev_activities = self._store.get_student_activity(
+            child_id, since=prev_week_start, until=week_start)
 
-    @staticmethod
-    def _active_days(activities: List[Dict[str, Any]]) -> int:
-        days = set()
-        for a in activities:
-            ts = a.get("timestamp")
-            if isinstance(ts, datetime):
-                days.add(ts.date())
-        return len(days)
+        (toplam_soru, dogru_sayisi, calisma_suresi, topic_stats,
+         aktif_gunler, en_uzun_seri) = self._summarize(activities)
+        dogru_orani = round((dogru_sayisi / toplam_soru) * 100, 2) if toplam_soru > 0 else 0.0
 
-    @staticmethod
-    def _longest_streak(activities: List[Dict[str, Any]]) -> int:
-        max_streak = 0
-        current = 0
-        for a in activities:
-            for r in a.get("results", []):
-                if r.get("correct"):
-                    current += 1
-                    max_streak = max(max_streak, current)
-                else:
-                    current = 0
-        return max_streak
+        prev_soru, prev_dogru, prev_sure, prev_topic_stats, _, _ = self._summarize(
+            prev_activities, detailed=False)
+        prev_dogru_orani = round((prev_dogru / prev_soru) * 100, 2) if prev_soru > 0 else 0.0
+
+        soru_degisim = self._percentage_change(prev_soru, toplam_soru)
+        dogruluk_degisim = round(dogru_orani - prev_dogru_orani, 2)
+        sure_degisim = self._percentage_change(prev_sure, calisma_suresi)
+
+        guclu = [t for t, s in topic_stats.items() if s >= 80]
+        zayif = [t for t, s in topic_stats.items() if s < 50]
+        gelisen = [t for t in topic_stats if t in prev_topic_stats and topic_stats[t] - prev_topic_stats[t] >= 10]
+        gerileyen = [t for t in topic_stats if t in prev_topic_stats and prev_topic_stats[t] - topic_stats[t] >= 10]
+        oneriler = self._generate_suggestions(dogru_orani, toplam_soru, calisma_suresi, aktif_gunler, zayif)
+        oncelikli = zayif[:3] if zayif else []
+
+        stats = {"toplam_soru": toplam_soru, "dogru_orani": dogru_orani,
+                 "calisma_suresi_dakika": calisma_suresi, "aktif_gun_sayisi": aktif_gunler,
+                 "en_uzun_seri": en_uzun_seri, "guclu_konular": guclu, "zayif_konular": zayif,
+                 "gelisen_konular": gelisen, "gerileyen_konular": gerileyen,
+                 "soru_degisim_yuzdesi": soru_degisim, "dogruluk_degisim": dogruluk_degisim,
+                 "sure_degisim_yuzdesi": sure_degisim, "oneriler": oneriler,
+                 "oncelikli_konular": oncelikli}
+        self._stats_cache[child_id] = (version, now, stats)
+        return stats
 
     @staticmethod
-    def _topic_breakdown(activities: List[Dict[str, Any]]) -> Dict[str, float]:
+    def _summarize(activities: List[ActivityRecord], detailed: bool = True
+                   ) -> Tuple[int, int, int, Dict[str, float], int, int]:
+        """
+        Aktivite listesinin tum ozetini tek geciste hesaplar.
+
+        (soru, dogru, dakika, konu dogruluklari, aktif gun, en uzun seri)
+        dondurur. ``detailed`` False ise aktif gun ve seri hesaplanmaz (0).
+        """
+        total_q = 0
+        total_c = 0
+        minutes = 0
         topic_correct: Dict[str, int] = {}
         topic_total: Dict[str, int] = {}
+        days = set()
+        flags: List[bytes] = []
         for a in activities:
-            topic = a.get("topic", "Genel")
-            answered = a.get("questions_answered", 0)
-            correct = a.get("correct_answers", 0)
+            topic = a.topic
+            answered = a.questions_answered
+            correct = a.correct_answers
+            total_q += answered
+            total_c += correct
+            minutes += a.duration_minutes
             topic_total[topic] = topic_total.get(topic, 0) + answered
             topic_correct[topic] = topic_correct.get(topic, 0) + correct
-        return {t: round((topic_correct.get(t, 0) / total) * 100, 2) if total > 0 else 0.0
-                for t, total in topic_total.items()}
+            if not detailed:
+                continue
+            ts = a.timestamp
+            if ts is not None:
+                days.add(ts.date())
+            flags.append(a.results_correct)
+        max_streak = _max_streak(b"".join(flags)) if detailed else 0
+        topic_stats = {t: round((topic_correct[t] / total) * 100, 2) if total > 0 else 0.0
+                       for t, total in topic_total.items()}
+        return total_q, total_c, minutes, topic_stats, len(days), max_streak
 
     @staticmethod
     def _percentage_change(old: float, new: float) -> float:
@@ -604,7 +966,7 @@ class GoalSettingService:
         }
 
         goal = LearningGoal(
-            goal_id=str(uuid.uuid4()),
+            goal_id=self._store.next_id("goal-"),
             parent_id=parent_id,
             child_id=child_id,
             goal_type=goal_type,
@@ -630,18 +992,18 @@ class GoalSettingService:
             raise KeyError(f"Hedef bulunamadi: {goal_id}")
 
         # Aktivite verilerinden ilerlemeyi hesapla
-        activities = self._store.get_student_activity(goal.child_id)
-        current = self._calculate_current_value(goal, activities)
+        now = datetime.utcnow()
+        current = self._calculate_current_value(goal, now)
         goal.current_value = current
         goal.progress_percentage = min(100.0, round((current / goal.target_value) * 100, 2))
 
         # Hedefe ulasildi mi?
         if goal.progress_percentage >= 100.0 and goal.completed_at is None:
-            goal.completed_at = datetime.utcnow()
+            goal.completed_at = now
 
         # Sure asimi kontrolu
         is_overdue = False
-        if goal.deadline and datetime.utcnow() > goal.deadline and goal.completed_at is None:
+        if goal.deadline and now > goal.deadline and goal.completed_at is None:
             is_overdue = True
 
         return {
@@ -662,39 +1024,10 @@ class GoalSettingService:
         if goal is not None:
             goal.is_active = False
 
-    @staticmethod
-    def _calculate_current_value(goal: LearningGoal, activities: List[Dict[str, Any]]) -> float:
+    def _calculate_current_value(self, goal: LearningGoal, now: datetime) -> float:
         """Aktivitelerden mevcut degeri hesaplar."""
-        # Son 7 gunluk aktiviteleri filtrele
-        week_ago = datetime.utcnow() - timedelta(days=7)
-        recent = [a for a in activities
-                  if a.get("timestamp", datetime.min) >= week_ago]
-
-        if goal.goal_type == GoalType.QUESTIONS_PER_WEEK:
-            return float(sum(a.get("questions_answered", 0) for a in recent))
-        elif goal.goal_type == GoalType.ACCURACY_TARGET:
-            total = sum(a.get("questions_answered", 0) for a in recent)
-            correct = sum(a.get("correct_answers", 0) for a in recent)
-            return round((correct / total) * 100, 2) if total > 0 else 0.0
-        elif goal.goal_type == GoalType.STREAK_TARGET:
-            max_streak = 0
-            current = 0
-            for a in recent:
-                for r in a.get("results", []):
-                    if r.get("correct"):
-                        current += 1
-                        max_streak = max(max_streak, current)
-                    else:
-                        current = 0
-            return float(max_streak)
-        elif goal.goal_type == GoalType.MASTERY_TARGET:
-            # Ortalama konu hakimiyeti
-            total = sum(a.get("questions_answered", 0) for a in activities)
-            correct = sum(a.get("correct_answers", 0) for a in activities)
-            return round((correct / total) * 100, 2) if total > 0 else 0.0
-        elif goal.goal_type == GoalType.PRACTICE_MINUTES:
-            return float(sum(a.get("duration_minutes", 0) for a in recent))
-        return 0.0
+        evaluator = _GOAL_EVALUATORS.get(goal.goal_type)
+        return evaluator(self._store, goal, now) if evaluator is not None else 0.0
 
 
 # ---------------------------------------------------------------------------
@@ -709,11 +1042,16 @@ class ClassAnalyticsService:
 
     def __init__(self, store: Optional[_DataStore] = None) -> None:
         self._store = store or _store
+        self._cache_hits = 0
+        self._cache_misses = 0
+        # class_id -> ((student_id, activity_version) anahtari, computed_at, snapshot)
+        self._snapshot_cache: Dict[str, Tuple[Tuple[Tuple[str, int], ...], datetime, ClassSnapshot]] = {}
 
     def get_class_overview(self, class_id: str) -> Dict[str, Any]:
         """Sinifin genel performans ozetini dondurur."""
-        students = self._store.get_class_students(class_id)
-        if not students:
+        snap = self._snapshot(class_id)
+        n = snap.n_students
+        if not n:
             return {
                 "class_id": class_id,
                 "ogrenci_sayisi": 0,
@@ -725,61 +1063,27 @@ class ClassAnalyticsService:
                 "en_zayif_konular": [],
             }
 
-        student_stats: List[Dict[str, Any]] = []
-        topic_accuracy: Dict[str, List[float]] = {}
-
-        for student_id in students:
-            activities = self._store.get_student_activity(student_id)
-            total_q = sum(a.get("questions_answered", 0) for a in activities)
-            correct = sum(a.get("correct_answers", 0) for a in activities)
-            minutes = sum(a.get("duration_minutes", 0) for a in activities)
-            accuracy = (correct / total_q * 100) if total_q > 0 else 0.0
-
-            student_stats.append({
-                "student_id": student_id,
-                "total_questions": total_q,
-                "accuracy": round(accuracy, 2),
-                "minutes": minutes,
-            })
-
-            # Konu bazli
-            for a in activities:
-                topic = a.get("topic", "Genel")
-                q = a.get("questions_answered", 0)
-                c = a.get("correct_answers", 0)
-                if q > 0:
-                    topic_accuracy.setdefault(topic, []).append(c / q * 100)
-
-        accuracies = [s["accuracy"] for s in student_stats]
-        total_questions = [s["total_questions"] for s in student_stats]
-        total_minutes = [s["minutes"] for s in student_stats]
-
         # Basari dagilimi
-        dagilim = {"cok_iyi": 0, "iyi": 0, "orta": 0, "zayif": 0, "cok_zayif": 0}
-        for acc in accuracies:
-            if acc >= 85:
-                dagilim["cok_iyi"] += 1
-            elif acc >= 70:
-                dagilim["iyi"] += 1
-            elif acc >= 55:
-                dagilim["orta"] += 1
-            elif acc >= 40:
-                dagilim["zayif"] += 1
-            else:
-                dagilim["cok_zayif"] += 1
+        dagilim = dict(zip(reversed(_DISTRIBUTION_BANDS), reversed(snap.band_counts)))
 
         # Konu siralamalari
-        topic_avgs = {t: round(statistics.mean(v), 2) for t, v in topic_accuracy.items() if v}
-        sorted_topics = sorted(topic_avgs.items(), key=lambda x: x[1], reverse=True)
-        en_basarili = [{"topic": t, "ortalama": v} for t, v in sorted_topics[:5]]
-        en_zayif = [{"topic": t, "ortalama": v} for t, v in sorted_topics[-5:]] if len(sorted_topics) >= 5 else []
+        # Ortalamalar yalnizca listelenen konular icin yuvarlanir
+        topic_avgs = {t: acc_sum / acc_n for t, (acc_sum, acc_n) in snap.topic_accuracy.items()}
+        by_avg = operator.itemgetter(1)
+        en_basarili = [{"topic": t, "ortalama": round(v, 2)}
+                       for t, v in heapq.nlargest(5, topic_avgs.items(), key=by_avg)]
+        en_zayif: List[Dict[str, Any]] = []
+        if len(topic_avgs) >= 5:
+            # Azalan siralamanin son 5 elemani (esitlikte sonra eklenen konular)
+            weakest = heapq.nsmallest(5, reversed(topic_avgs.items()), key=by_avg)
+            en_zayif = [{"topic": t, "ortalama": round(v, 2)} for t, v in reversed(weakest)]
 
         return {
             "class_id": class_id,
-            "ogrenci_sayisi": len(students),
-            "ortalama_dogruluk": round(statistics.mean(accuracies), 2) if accuracies else 0.0,
-            "ortalama_soru_sayisi": round(statistics.mean(total_questions), 1) if total_questions else 0.0,
-            "ortalama_calisma_suresi": round(statistics.mean(total_minutes), 1) if total_minutes else 0.0,
+            "ogrenci_sayisi": n,
+            "ortalama_dogruluk": round(snap.sum_acc / n, 2),
+            "ortalama_soru_sayisi": round(snap.sum_q / n, 1),
+            "ortalama_calisma_suresi": round(snap.sum_min / n, 1),
             "basari_dagilimi": dagilim,
             "en_basarili_konular": en_basarili,
             "en_zayif_konular": en_zayif,
@@ -787,28 +1091,17 @@ class ClassAnalyticsService:
 
     def get_topic_analysis(self, class_id: str) -> List[Dict[str, Any]]:
         """Sinifin konu bazli detayli analizini dondurur."""
-        students = self._store.get_class_students(class_id)
-        topic_data: Dict[str, Dict[str, Any]] = {}
-
-        for student_id in students:
-            activities = self._store.get_student_activity(student_id)
-            for a in activities:
-                topic = a.get("topic", "Genel")
-                if topic not in topic_data:
-                    topic_data[topic] = {"total_q": 0, "correct": 0, "students": set()}
-                topic_data[topic]["total_q"] += a.get("questions_answered", 0)
-                topic_data[topic]["correct"] += a.get("correct_answers", 0)
-                topic_data[topic]["students"].add(student_id)
-
+        snap = self._snapshot(class_id)
+        n_students = snap.n_students
         result: List[Dict[str, Any]] = []
-        for topic, data in topic_data.items():
-            accuracy = (data["correct"] / data["total_q"] * 100) if data["total_q"] > 0 else 0.0
+        for topic, (total_q, correct, n) in snap.topic_totals.items():
+            accuracy = (correct / total_q * 100) if total_q > 0 else 0.0
             result.append({
                 "topic": topic,
-                "toplam_soru": data["total_q"],
+                "toplam_soru": total_q,
                 "dogruluk_orani": round(accuracy, 2),
-                "katilan_ogrenci": len(data["students"]),
-                "ogrenci_orani": round(len(data["students"]) / len(students) * 100, 1) if students else 0.0,
+                "katilan_ogrenci": n,
+                "ogrenci_orani": round(n / n_students * 100, 1) if n_students else 0.0,
             })
 
         result.sort(key=lambda x: x["dogruluk_orani"])
@@ -816,28 +1109,108 @@ class ClassAnalyticsService:
 
     def get_at_risk_students(self, class_id: str) -> List[Dict[str, Any]]:
         """Risk altindaki ogrencileri tespit eder."""
+        risk_records = self._snapshot(class_id).risk_records
+        names = self._store.get_student_names(record[0] for record in risk_records)
+        return [{
+            "student_id": student_id,
+            "student_name": names[student_id],
+            "dogruluk_orani": round(accuracy, 2),
+            "haftalik_soru": recent_q,
+            "aktif_gun": active_days,
+            "risk_faktorleri": list(risk_factors),
+            "risk_seviyesi": "yuksek" if len(risk_factors) >= 3 else "orta",
+        } for student_id, accuracy, recent_q, active_days, risk_factors in risk_records]
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Sinif goruntusu onbelleginin isabet istatistiklerini dondurur."""
+        return {"hits": self._cache_hits, "misses": self._cache_misses,
+                "size": len(self._snapshot_cache)}
+
+    # -- Private helpers ---------------------------------------------------
+
+    def _snapshot(self, class_id: str) -> ClassSnapshot:
+        """
+        Sinif goruntusunu dondurur. Ogrenci listesi ve aktivite surumleri
+        degismedikce TTL suresince onbellekten okunur (ayni panelin uc uc
+        noktasi art arda cagrildiginda sinif tek kez taranir).
+        """
         students = self._store.get_class_students(class_id)
-        at_risk: List[Dict[str, Any]] = []
+        versions = self._store.activity_version
+        key = tuple((student_id, versions.get(student_id, 0)) for student_id in students)
+        now = datetime.utcnow()
+        cached = self._snapshot_cache.get(class_id)
+        if cached is not None and cached[0] == key and now - cached[1] < _REPORT_CACHE_TTL:
+            self._cache_hits += 1
+            return cached[2]
+        self._cache_misses += 1
+        snap = self._build_snapshot(students, now)
+        self._snapshot_cache[class_id] = (key, now, snap)
+        return snap
+
+    def _build_snapshot(self, students: List[str], now: datetime) -> ClassSnapshot:
+        """Sinifi tek geciste tarayarak genel, konu ve risk verisini birlikte cikarir."""
+        band_counts = [0] * len(_DISTRIBUTION_BANDS)
+        sum_acc = 0.0
+        sum_q = 0
+        sum_min = 0
+        # Konu toplamlari store konu kodlariyla indekslenen listelerde tutulur;
+        # *_order listeleri konulari ilk gorulme sirasiyla verir. Ogrenci toplamlari
+        # zaten konuya gore gruplu oldugundan her ogrenci bir konuya en fazla bir
+        # kez katkida bulunur.
+        # Ogrenci toplamlari aktivite yaziminda guncellenir; konu kodlari da o sirada atanir
+        aggregates = [self._store.get_student_aggregate(student_id) for student_id in students]
+        n_topics = len(self._store.topic_names)
+        acc_sums = [0.0] * n_topics
+        acc_counts = [0] * n_topics
+        acc_order: List[int] = []
+        q_sums = [0] * n_topics
+        c_sums = [0] * n_topics
+        katilan = [0] * n_topics
+        totals_order: List[int] = []
+        risk_records: List[Tuple[str, float, int, int, Tuple[str, ...]]] = []
+        week_ago = now - timedelta(days=7)
+        first_day = week_ago.toordinal()
+
+        for student_id, agg in zip(students, aggregates):
+            total_q = agg.total_q
+            raw_accuracy = (agg.correct / total_q * 100) if total_q > 0 else 0.0
+            accuracy = round(raw_accuracy, 2)
+            band_counts[bisect.bisect_right(_DISTRIBUTION_THRESHOLDS, accuracy)] += 1
+            sum_acc += accuracy
+            sum_q += total_q
+            sum_min += agg.minutes
 
-        for student_id in students:
-            activities = self._store.get_student_activity(student_id)
-            total_q = sum(a.get("questions_answered", 0) for a in activities)
-            correct = sum(a.get("correct_answers", 0) for a in activities)
-            accuracy = (correct / total_q * 100) if total_q > 0 else 0.0
-            minutes = sum(a.get("duration_minutes", 0) for a in activities)
-
-            # Son 7 gun aktivite
-            week_ago = datetime.utcnow() - timedelta(days=7)
-            recent = [a for a in activities
-                      if a.get("timestamp", datetime.min) >= week_ago]
-            recent_q = sum(a.get("questions_answered", 0) for a in recent)
-            active_days = len(set(
-                a.get("timestamp", datetime.min).date()
-                for a in recent if isinstance(a.get("timestamp"), datetime)
-            ))
+            # Konu bazli
+            for code, (acc_sum, acc_n) in agg.topic_accuracy_sums.items():
+                if not acc_counts[code]:
+                    acc_order.append(code)
+                acc_sums[code] += acc_sum
+                acc_counts[code] += acc_n
+            for code, (q, c) in agg.topic_totals.items():
+                if not katilan[code]:
+                    totals_order.append(code)
+                q_sums[code] += q
+                c_sums[code] += c
+                katilan[code] += 1
+
+            if not agg.topic_totals:
+                # Hic aktivitesi olmayan ogrenci: dort risk faktoru de kesin, pencere taranmaz
+                risk_records.append((student_id, 0.0, 0, 0, _NO_ACTIVITY_RISK_FACTORS))
+                continue
+
+            # Son 7 gun bisect ile dilimlenir; aktif gunler: bit i = week_ago + i gun
+            recent_q = 0
+            day_mask = 0
+            for a in self._store.get_student_activity(student_id, since=week_ago):
+                if a.timestamp is None:
+                    # Zaman damgasiz kayit haftalik pencereye girmez
+                    continue
+                recent_q += a.questions_answered
+                day_mask |= 1 << (a.timestamp.toordinal() - first_day)
+            active_days = day_mask.bit_count()
 
             risk_factors: List[str] = []
-            if accuracy < 40:
+            if raw_accuracy < 40:
                 risk_factors.append("Dusuk dogruluk orani")
             if recent_q < 5:
                 risk_factors.append("Az soru cozuyor")
@@ -845,20 +1218,21 @@ class ClassAnalyticsService:
                 risk_factors.append("Duzenli calismiyor")
             if total_q == 0:
                 risk_factors.append("Hic aktivite yok")
-
             if risk_factors:
-                at_risk.append({
-                    "student_id": student_id,
-                    "student_name": self._store.get_student_name(student_id),
-                    "dogruluk_orani": round(accuracy, 2),
-                    "haftalik_soru": recent_q,
-                    "aktif_gun": active_days,
-                    "risk_faktorleri": risk_factors,
-                    "risk_seviyesi": "yuksek" if len(risk_factors) >= 3 else "orta",
-                })
-
-        at_risk.sort(key=lambda x: len(x["risk_faktorleri"]), reverse=True)
-        return at_risk
+                risk_records.append((student_id, raw_accuracy, recent_q, active_days, tuple(risk_factors)))
+
+        risk_records.sort(key=lambda r: len(r[4]), reverse=True)
+        names = self._store.topic_names
+        return ClassSnapshot(
+            n_students=len(students),
+            sum_acc=sum_acc,
+            sum_q=sum_q,
+            sum_min=sum_min,
+            band_counts=tuple(band_counts),
+            topic_accuracy={names[code]: (acc_sums[code], acc_counts[code]) for code in acc_order},
+            topic_totals={names[code]: (q_sums[code], c_sums[code], katilan[code]) for code in totals_order},
+            risk_records=tuple(risk_records),
+        )
 
 
 # ---------------------------------------------------------------------------
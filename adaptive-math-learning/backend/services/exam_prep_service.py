@@ -20,14 +20,23 @@ MEB Curriculum Topic Weights (official distribution):
            Limit-Turev-Integral %25, Sayilar %15
 """
 
-from typing import Optional, Dict, Any, List
-from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, Callable, Deque, List, Tuple
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field, replace
 from enum import Enum
 from datetime import datetime, timedelta
+from fractions import Fraction
+from functools import lru_cache
 import uuid
+import heapq
+import itertools
 import math
+import operator
 import random
+import re
+import string
 import logging
+import time
 
 from question_engine.base import QuestionType, GeneratedQuestion
 from question_engine.registry import registry
@@ -59,7 +68,7 @@ class ExamSessionStatus(str, Enum):
 # Data classes
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class TopicWeight:
     """A single topic's weight inside an exam blueprint."""
     topic_slug: str
@@ -70,7 +79,7 @@ class TopicWeight:
     difficulty_range: tuple     # (min_difficulty, max_difficulty) 0.0-1.0
 
 
-@dataclass
+@dataclass(slots=True)
 class ExamQuestion:
     """A question within an exam session, with metadata."""
     question_number: int
@@ -82,8 +91,32 @@ class ExamQuestion:
     answered_at: Optional[datetime] = None
     time_spent_seconds: Optional[float] = None
 
+    @classmethod
+    def _fast_create(
+        cls,
+        question_number: int,
+        generated_question: GeneratedQuestion,
+        topic_slug: str,
+        topic_name_tr: str,
+    ) -> "ExamQuestion":
+        """
+        Build an unanswered question without the keyword-binding ``__init__``.
 
-@dataclass
+        Used on the question-generation hot path; must assign every field.
+        """
+        self = cls.__new__(cls)
+        self.question_number = question_number
+        self.generated_question = generated_question
+        self.topic_slug = topic_slug
+        self.topic_name_tr = topic_name_tr
+        self.user_answer = None
+        self.is_correct = None
+        self.answered_at = None
+        self.time_spent_seconds = None
+        return self
+
+
+@dataclass(slots=True)
 class ExamSession:
     """A complete exam session with timing and question state."""
     session_id: str
@@ -126,8 +159,35 @@ class ExamSession:
             return 0.0
         return self.correct_count / answered
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Serialise session to a JSON-safe dictionary."""
+    def to_dict(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Serialise session to a JSON-safe dictionary.
+
+        Args:
+            now: Optional ``datetime.utcnow()`` reading shared by callers
+                 serialising many sessions at once.
+        """
+        if self.status != ExamSessionStatus.ACTIVE:
+            remaining = 0.0
+        else:
+            if now is None:
+                now = datetime.utcnow()
+            remaining = max((self.expires_at - now).total_seconds(), 0.0)
+        # Answers applied in one evaluation share a timestamp with
+        # completed_at, so each distinct datetime is formatted only once;
+        # the answer counts are tallied in the same pass
+        iso: Dict[Optional[datetime], Optional[str]] = {None: None}
+        if self.completed_at is not None:
+            iso[self.completed_at] = self.completed_at.isoformat()
+        answered = correct = 0
+        for q in self.questions:
+            if q.user_answer is not None:
+                answered += 1
+            if q.is_correct is True:
+                correct += 1
+            dt = q.answered_at
+            if dt not in iso:
+                iso[dt] = dt.isoformat()
         return {
             "session_id": self.session_id,
             "user_id": self.user_id,
@@ -135,14 +195,14 @@ class ExamSession:
             "session_type": self.session_type,
             "status": self.status.value,
             "total_questions": self.total_questions,
-            "answered_count": self.answered_count,
-            "correct_count": self.correct_count,
-            "accuracy": round(self.accuracy, 4),
+            "answered_count": answered,
+            "correct_count": correct,
+            "accuracy": round(correct / answered, 4) if answered else 0.0,
             "time_limit_minutes": self.time_limit_minutes,
-            "remaining_seconds": round(self.remaining_seconds, 1),
+            "remaining_seconds": round(remaining, 1),
             "started_at": self.started_at.isoformat(),
             "expires_at": self.expires_at.isoformat(),
-            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "completed_at": iso[self.completed_at],
             "questions": [
                 {
                     "question_number": q.question_number,
@@ -151,7 +211,7 @@ class ExamSession:
                     "question": q.generated_question.to_dict(),
                     "user_answer": q.user_answer,
                     "is_correct": q.is_correct,
-                    "answered_at": q.answered_at.isoformat() if q.answered_at else None,
+                    "answered_at": iso[q.answered_at],
                     "time_spent_seconds": q.time_spent_seconds,
                 }
                 for q in self.questions
@@ -159,7 +219,7 @@ class ExamSession:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class TopicResult:
     """Performance result for a single topic within an exam."""
     topic_slug: str
@@ -171,7 +231,7 @@ class TopicResult:
     weight_in_exam: float
 
 
-@dataclass
+@dataclass(slots=True)
 class ExamResult:
     """Detailed result analysis after an exam is evaluated."""
     session_id: str
@@ -231,7 +291,7 @@ class ExamResult:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ExamStatistics:
     """Aggregated exam statistics for a user and exam type."""
     user_id: str
@@ -268,6 +328,47 @@ class ExamStatistics:
         }
 
 
+@dataclass(slots=True)
+class _UserExamAggregate:
+    """
+    Running totals over a user's evaluated exams for one exam type.
+
+    Updated once per evaluation so ``get_exam_statistics`` does not have to
+    walk the full result history.
+    """
+    sessions: int = 0
+    total_correct: int = 0
+    total_answered: int = 0
+    total_questions: int = 0
+    total_time: float = 0.0
+    sum_net: float = 0.0
+    best_net: float = 0.0
+    # slug -> [correct, total], in first-seen order
+    topic_counts: Dict[str, List[int]] = field(default_factory=dict)
+    net_trend: Deque[float] = field(default_factory=lambda: deque(maxlen=20))
+    last_evaluated_at: Optional[datetime] = None
+
+    def add(self, result: ExamResult) -> None:
+        """Fold one exam result into the totals."""
+        net = result.net_score
+        self.best_net = net if self.sessions == 0 else max(self.best_net, net)
+        self.sessions += 1
+        self.total_correct += result.correct_answers
+        self.total_answered += result.correct_answers + result.wrong_answers
+        self.total_questions += result.total_questions
+        self.total_time += result.time_used_seconds
+        self.sum_net += net
+        self.net_trend.append(net)
+        self.last_evaluated_at = result.evaluated_at
+        for tr in result.topic_results:
+            counts = self.topic_counts.get(tr.topic_slug)
+            if counts is None:
+                self.topic_counts[tr.topic_slug] = [tr.correct_answers, tr.total_questions]
+            else:
+                counts[0] += tr.correct_answers
+                counts[1] += tr.total_questions
+
+
 # ---------------------------------------------------------------------------
 # MEB Curriculum Topic Weight Definitions
 # ---------------------------------------------------------------------------
@@ -423,6 +524,34 @@ _TOPIC_WEIGHTS_MAP: Dict[ExamType, List[TopicWeight]] = {
     ExamType.AYT: _AYT_TOPIC_WEIGHTS,
 }
 
+# Per-exam slug lookups, built once at import (read-only)
+_TOPIC_WEIGHT_MAPS: Dict[ExamType, Dict[str, float]] = {
+    et: {tw.topic_slug: tw.weight for tw in tws}
+    for et, tws in _TOPIC_WEIGHTS_MAP.items()
+}
+_TOPIC_NAME_MAPS: Dict[ExamType, Dict[str, str]] = {
+    et: {tw.topic_slug: tw.topic_name_tr for tw in tws}
+    for et, tws in _TOPIC_WEIGHTS_MAP.items()
+}
+
+# Statistics for a user with no evaluated exams; copied per request
+_ZERO_STATISTICS: Dict[ExamType, ExamStatistics] = {
+    et: ExamStatistics(
+        user_id="",
+        exam_type=et,
+        total_sessions=0,
+        total_questions_answered=0,
+        overall_accuracy=0.0,
+        average_net_score=0.0,
+        best_net_score=0.0,
+        average_time_per_question_seconds=0.0,
+        topic_accuracy=dict.fromkeys(names, 0.0),
+        score_trend=[],
+        last_session_at=None,
+    )
+    for et, names in _TOPIC_NAME_MAPS.items()
+}
+
 # Official exam specifications
 _EXAM_SPECS: Dict[ExamType, Dict[str, int]] = {
     ExamType.LGS: {"question_count": 20, "time_limit_minutes": 40},
@@ -430,6 +559,144 @@ _EXAM_SPECS: Dict[ExamType, Dict[str, int]] = {
     ExamType.AYT: {"question_count": 40, "time_limit_minutes": 75},
 }
 
+# Approximate grade level passed to question generators
+_EXAM_GRADE: Dict[ExamType, int] = {
+    ExamType.LGS: 8,
+    ExamType.TYT: 10,
+    ExamType.AYT: 12,
+}
+
+
+# Turkish recommendation templates used by _generate_recommendations
+_EXAM_LABELS: Dict[ExamType, str] = {
+    ExamType.LGS: "LGS",
+    ExamType.TYT: "TYT",
+    ExamType.AYT: "AYT",
+}
+_REC_NO_WEAKNESS = (
+    "Tebrikler! {exam} konularinda genel performansiniz iyi. "
+    "Daha da ilerlemek icin zorluk seviyesini artirmaya calisin."
+)
+_REC_VERY_WEAK = (
+    "{name} konusunda cok fazla calismaya ihtiyaciniz var (%{pct} basari). "
+    "Temel kavramlari tekrar edin ve bol bol ornek soru cozun."
+)
+_REC_WEAK = (
+    "{name} konusunu guclendirmelisiniz (%{pct} basari). "
+    "Yanlis yaptiginiz sorularin cozumlerini inceleyin ve benzer "
+    "sorularla pratik yapin."
+)
+_REC_SLOW_TOPICS = (
+    "Zaman yonetimi: {names} konularinda soru basina cok zaman "
+    "harciyorsunuz. Hizli cozum teknikleri uzerinde calisin."
+)
+_REC_LGS_TIP = (
+    "LGS'de her soru esit puana sahiptir. Emin olmadiginiz soruyu bos "
+    "birakmak yerine eleme yontemiyle cevap vermeye calisin."
+)
+_REC_NEGATIVE_MARKING_TIP = (
+    "{exam}'de her yanlis 1/4 dogru puani goturur. Emin olmadiginiz "
+    "sorulari bos birakmak daha avantajli olabilir."
+)
+
+
+# ---------------------------------------------------------------------------
+# Answer normalisation
+# ---------------------------------------------------------------------------
+
+# Answers without any digit (option letters, words) are never parsed as
+# numbers; the only such strings float() accepts are inf/nan spellings,
+# which cannot satisfy the tolerance checks anyway.
+_HAS_DIGIT = re.compile(r"\d").search
+
+# Lower-cases ASCII letters and drops spaces in a single pass
+_ASCII_ANSWER_TABLE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase, " ")
+
+
+@lru_cache(maxsize=4096)
+def _normalize_answer(
+    raw: str,
+) -> Tuple[str, Optional[float], Optional[Fraction]]:
+    """
+    Normalise an answer string once for all comparison modes.
+
+    Returns ``(text, number, fraction)`` where *text* is lower-cased with
+    spaces removed, *number* is its float value (``,`` accepted as the
+    decimal separator) and *fraction* its ``Fraction`` value when it
+    contains a ``/``.  Unparseable forms are ``None``.  Correct answers
+    are shared by every student, so they are usually cache hits.
+    """
+    if raw.isascii():
+        text = raw.translate(_ASCII_ANSWER_TABLE).strip()
+    else:
+        # Full Unicode lower-casing (e.g. Turkish letters)
+        text = raw.strip().lower().replace(" ", "")
+    number: Optional[float] = None
+    fraction: Optional[Fraction] = None
+    if _HAS_DIGIT(text) is None:
+        return text, number, fraction
+    if "/" in text:
+        # float() never accepts a slash, so only the fraction form applies
+        try:
+            fraction = Fraction(text)
+        except (ValueError, ZeroDivisionError):
+            pass
+    else:
+        try:
+            number = float(text.replace(",", "."))
+        except ValueError:
+            pass
+    return text, number, fraction
+
+
+@lru_cache(maxsize=4096)
+def _answer_checker(correct_raw: str) -> Callable[[str], bool]:
+    """
+    Build a grader specialised to one correct answer.
+
+    The correct answer is classified once (number, fraction or plain
+    text) so grading a submission only normalises the student's answer
+    and runs the comparisons that can apply.
+    """
+    correct_str, correct_num, correct_frac = _normalize_answer(correct_raw)
+
+    if correct_num is not None:
+        def check(user_raw: str) -> bool:
+            user_str, user_num, _ = _normalize_answer(user_raw)
+            if user_str == correct_str:
+                return True
+            if user_num is None:
+                return False
+            if abs(user_num - correct_num) < 1e-6:
+                return True
+            # Percentage-based tolerance for larger numbers
+            return correct_num != 0 and abs(
+                (user_num - correct_num) / correct_num
+            ) < 0.005
+    elif correct_frac is not None:
+        def check(user_raw: str) -> bool:
+            # Fraction comparison: e.g. "2/4" == "1/2"
+            user_str, _, user_frac = _normalize_answer(user_raw)
+            return user_str == correct_str or user_frac == correct_frac
+    else:
+        def check(user_raw: str) -> bool:
+            return _normalize_answer(user_raw)[0] == correct_str
+
+    return check
+
+
+@lru_cache(maxsize=1024)
+def _sigmoid_percentile(normalised: float) -> float:
+    """
+    Map a normalised score to a rough percentile via a logistic curve.
+
+    Net scores move in quarter-point steps, so each exam length only ever
+    produces a few hundred distinct inputs; caching avoids the ``exp``.
+    """
+    z = (normalised - 0.5) * 6
+    percentile = 100.0 / (1.0 + math.exp(-z))
+    return min(max(percentile, 0.0), 99.9)
+
 
 # ---------------------------------------------------------------------------
 # Service
@@ -454,13 +721,27 @@ class ExamPrepService:
         stats   = service.get_exam_statistics(user_id="u1", exam_type=ExamType.LGS)
     """
 
-    # In-memory stores (replace with DB in production deployment)
-    _sessions: Dict[str, ExamSession] = {}
-    _results: Dict[str, ExamResult] = {}
-    _user_results: Dict[str, List[ExamResult]] = {}
-
-    def __init__(self, db: Any = None) -> None:
+    # In-memory stores (replace with DB in production deployment).
+    # Sessions and results are evicted oldest-first beyond _MAX_SESSIONS;
+    # long-run statistics live in the per-user aggregates, which are never
+    # evicted (each entry is small: its score trend is a bounded deque).
+    _MAX_SESSIONS = 10_000
+    _sessions: "OrderedDict[str, ExamSession]" = OrderedDict()
+    # session_id -> (started, expires) on the monotonic clock; kept off the
+    # serialised ExamSession and evicted in step with _sessions
+    _session_clocks: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+    _results: "OrderedDict[str, ExamResult]" = OrderedDict()
+    _user_aggregates: Dict[Tuple[str, ExamType], _UserExamAggregate] = {}
+
+    def __init__(
+        self,
+        db: Any = None,
+        rng: Optional[random.Random] = None,
+    ) -> None:
         self.db = db
+        # Difficulty draws and question shuffling; pass a seeded instance
+        # for reproducible exams
+        self._rng = rng if rng is not None else random.Random()
 
     # ------------------------------------------------------------------
     # Public API
@@ -489,7 +770,7 @@ class ExamPrepService:
         Returns:
             A fully populated ``ExamSession`` ready for the student.
         """
-        topic_weights = self.get_topic_weights(exam_type)
+        topic_weights = self._topic_weights(exam_type)
 
         # Time limit: scale proportionally from the official mock-exam spec
         spec = _EXAM_SPECS[exam_type]
@@ -504,8 +785,8 @@ class ExamPrepService:
                 topic_slug, topic_weights, question_count,
             )
         else:
-            topic_distribution = self._build_weighted_distribution(
-                topic_weights, question_count,
+            topic_distribution = self._weighted_distribution(
+                exam_type, question_count,
             )
 
         # Generate questions
@@ -513,7 +794,7 @@ class ExamPrepService:
 
         now = datetime.utcnow()
         session = ExamSession(
-            session_id=str(uuid.uuid4()),
+            session_id=uuid.uuid4().hex,
             user_id=user_id,
             exam_type=exam_type,
             session_type="practice",
@@ -525,7 +806,8 @@ class ExamPrepService:
             expires_at=now + timedelta(minutes=time_limit_minutes),
         )
 
-        self._sessions[session.session_id] = session
+        self._remember(self._sessions, session.session_id, session)
+        self._start_clock(session)
         logger.info(
             "Created exam session %s for user %s (%s, %d questions, %d min)",
             session.session_id, user_id, exam_type.value,
@@ -556,16 +838,14 @@ class ExamPrepService:
             A timed ``ExamSession`` representing the full mock exam.
         """
         spec = _EXAM_SPECS[exam_type]
-        topic_weights = self.get_topic_weights(exam_type)
-
-        topic_distribution = self._build_weighted_distribution(
-            topic_weights, spec["question_count"],
+        topic_distribution = self._weighted_distribution(
+            exam_type, spec["question_count"],
         )
         questions = self._generate_questions(topic_distribution, exam_type)
 
         now = datetime.utcnow()
         session = ExamSession(
-            session_id=str(uuid.uuid4()),
+            session_id=uuid.uuid4().hex,
             user_id=user_id,
             exam_type=exam_type,
             session_type="mock",
@@ -577,7 +857,8 @@ class ExamPrepService:
             expires_at=now + timedelta(minutes=spec["time_limit_minutes"]),
         )
 
-        self._sessions[session.session_id] = session
+        self._remember(self._sessions, session.session_id, session)
+        self._start_clock(session)
         logger.info(
             "Created mock exam %s for user %s (%s, %d questions, %d min)",
             session.session_id, user_id, exam_type.value,
@@ -603,76 +884,42 @@ class ExamPrepService:
         Returns:
             An ``ExamStatistics`` instance with aggregated data.
         """
-        key = f"{user_id}:{exam_type.value}"
-        results: List[ExamResult] = self._user_results.get(key, [])
+        agg = self._user_aggregates.get((user_id, exam_type))
 
-        if not results:
-            topic_weights = self.get_topic_weights(exam_type)
-            return ExamStatistics(
+        if agg is None:
+            template = _ZERO_STATISTICS[exam_type]
+            return replace(
+                template,
                 user_id=user_id,
-                exam_type=exam_type,
-                total_sessions=0,
-                total_questions_answered=0,
-                overall_accuracy=0.0,
-                average_net_score=0.0,
-                best_net_score=0.0,
-                average_time_per_question_seconds=0.0,
-                topic_accuracy={tw.topic_slug: 0.0 for tw in topic_weights},
+                topic_accuracy=template.topic_accuracy.copy(),
                 score_trend=[],
-                last_session_at=None,
             )
 
-        total_correct = sum(r.correct_answers for r in results)
-        total_answered = sum(
-            r.correct_answers + r.wrong_answers for r in results
-        )
-        total_questions = sum(r.total_questions for r in results)
         overall_accuracy = (
-            total_correct / total_answered if total_answered else 0.0
+            agg.total_correct / agg.total_answered if agg.total_answered else 0.0
         )
-
-        net_scores = [r.net_score for r in results]
-        avg_net = sum(net_scores) / len(net_scores) if net_scores else 0.0
-        best_net = max(net_scores) if net_scores else 0.0
-
-        # Per-topic accuracy aggregation
-        topic_correct: Dict[str, int] = {}
-        topic_total: Dict[str, int] = {}
-        for result in results:
-            for tr in result.topic_results:
-                topic_correct[tr.topic_slug] = (
-                    topic_correct.get(tr.topic_slug, 0) + tr.correct_answers
-                )
-                topic_total[tr.topic_slug] = (
-                    topic_total.get(tr.topic_slug, 0) + tr.total_questions
-                )
         topic_accuracy = {
-            slug: (
-                topic_correct[slug] / topic_total[slug]
-                if topic_total[slug] else 0.0
-            )
-            for slug in topic_total
+            slug: (t_correct / t_total if t_total else 0.0)
+            for slug, (t_correct, t_total) in agg.topic_counts.items()
         }
 
         # Average time per question
-        total_time = sum(r.time_used_seconds for r in results)
-        avg_time = total_time / total_questions if total_questions else 0.0
-
-        # Score trend (last 20 sessions)
-        score_trend = net_scores[-20:]
+        avg_time = (
+            agg.total_time / agg.total_questions if agg.total_questions else 0.0
+        )
 
         return ExamStatistics(
             user_id=user_id,
             exam_type=exam_type,
-            total_sessions=len(results),
-            total_questions_answered=total_answered,
+            total_sessions=agg.sessions,
+            total_questions_answered=agg.total_answered,
             overall_accuracy=overall_accuracy,
-            average_net_score=avg_net,
-            best_net_score=best_net,
+            average_net_score=agg.sum_net / agg.sessions,
+            best_net_score=agg.best_net,
             average_time_per_question_seconds=avg_time,
             topic_accuracy=topic_accuracy,
-            score_trend=score_trend,
-            last_session_at=results[-1].evaluated_at if results else None,
+            score_trend=list(agg.net_trend),  # last 20 sessions
+            last_session_at=agg.last_evaluated_at,
         )
 
     @staticmethod
@@ -692,10 +939,7 @@ class ExamPrepService:
         Raises:
             ValueError: If the exam type is unknown.
         """
-        weights = _TOPIC_WEIGHTS_MAP.get(exam_type)
-        if weights is None:
-            raise ValueError(f"Unknown exam type: {exam_type}")
-        return list(weights)
+        return list(ExamPrepService._topic_weights(exam_type))
 
     def evaluate_exam(
         self,
@@ -736,38 +980,64 @@ class ExamPrepService:
             )
 
         # Mark the session as expired if time ran out
-        if session.is_expired:
+        if self._is_expired(session):
             session.status = ExamSessionStatus.EXPIRED
 
         now = datetime.utcnow()
-
-        # Apply answers
-        for question in session.questions:
-            qnum = question.question_number
-            if qnum in answers:
-                question.user_answer = answers[qnum]
-                question.answered_at = now
-                question.is_correct = self._check_answer(
-                    question.generated_question, answers[qnum],
-                )
-                # Estimate time spent (evenly distributed as approximation)
-                elapsed = (now - session.started_at).total_seconds()
-                question.time_spent_seconds = elapsed / max(len(answers), 1)
+        elapsed = self._elapsed_seconds(session, now)
+        # Estimate time spent (evenly distributed as approximation)
+        per_question_time = elapsed / max(len(answers), 1)
+
+        topic_weight_map = _TOPIC_WEIGHT_MAPS[session.exam_type]
+        topic_name_map = _TOPIC_NAME_MAPS[session.exam_type]
+
+        # Single pass: apply answers, tally scores and per-topic counts
+        correct = 0
+        wrong = 0
+        unanswered = 0
+        # slug -> [correct, total, timed_count], in first-seen order
+        topic_agg: Dict[str, List[Any]] = {}
+        if not answers:
+            # Nothing submitted: every question is unanswered and only the
+            # per-topic sizes are needed
+            unanswered = len(session.questions)
+            for question in session.questions:
+                agg = topic_agg.get(question.topic_slug)
+                if agg is None:
+                    agg = topic_agg[question.topic_slug] = [0, 0, 0]
+                agg[1] += 1
+        else:
+            for question in session.questions:
+                qnum = question.question_number
+                if qnum in answers:
+                    answer = answers[qnum]
+                    question.user_answer = answer
+                    question.answered_at = now
+                    question.is_correct = self._check_answer(
+                        question.generated_question, answer,
+                    )
+                    question.time_spent_seconds = per_question_time
+
+                is_correct = question.is_correct is True
+                if is_correct:
+                    correct += 1
+                if question.user_answer is None:
+                    unanswered += 1
+                elif question.is_correct is False:
+                    wrong += 1
+
+                agg = topic_agg.get(question.topic_slug)
+                if agg is None:
+                    agg = topic_agg[question.topic_slug] = [0, 0, 0]
+                agg[0] += is_correct
+                agg[1] += 1
+                if question.time_spent_seconds is not None:
+                    agg[2] += 1
 
         # Mark session completed
         session.status = ExamSessionStatus.COMPLETED
         session.completed_at = now
 
-        # Tally scores
-        correct = sum(1 for q in session.questions if q.is_correct is True)
-        wrong = sum(
-            1 for q in session.questions
-            if q.is_correct is False and q.user_answer is not None
-        )
-        unanswered = sum(
-            1 for q in session.questions if q.user_answer is None
-        )
-
         raw_score = (
             correct / session.total_questions
             if session.total_questions else 0.0
@@ -781,30 +1051,15 @@ class ExamPrepService:
             net_score = correct - (wrong / 4.0)
 
         # Per-topic breakdown
-        topic_weights = self.get_topic_weights(session.exam_type)
-        topic_weight_map = {tw.topic_slug: tw.weight for tw in topic_weights}
-        topic_name_map = {
-            tw.topic_slug: tw.topic_name_tr for tw in topic_weights
-        }
-
-        topic_questions: Dict[str, List[ExamQuestion]] = {}
-        for q in session.questions:
-            topic_questions.setdefault(q.topic_slug, []).append(q)
-
         topic_results: List[TopicResult] = []
         weighted_score = 0.0
         strengths: List[str] = []
         weaknesses: List[str] = []
 
-        for slug, qs in topic_questions.items():
-            t_total = len(qs)
-            t_correct = sum(1 for q in qs if q.is_correct is True)
+        for slug, (t_correct, t_total, t_timed) in topic_agg.items():
             t_accuracy = t_correct / t_total if t_total else 0.0
-            t_times = [
-                q.time_spent_seconds for q in qs
-                if q.time_spent_seconds is not None
-            ]
-            t_avg_time = sum(t_times) / len(t_times) if t_times else 0.0
+            # Every timed question carries the same per-question estimate
+            t_avg_time = per_question_time if t_timed else 0.0
             t_weight = topic_weight_map.get(slug, 0.0)
 
             topic_results.append(TopicResult(
@@ -825,7 +1080,7 @@ class ExamPrepService:
                 weaknesses.append(slug)
 
         # Sort topic results by weight descending
-        topic_results.sort(key=lambda tr: tr.weight_in_exam, reverse=True)
+        topic_results.sort(key=operator.attrgetter("weight_in_exam"), reverse=True)
 
         # Rough percentile estimate based on net score
         estimated_percentile = self._estimate_percentile(
@@ -837,7 +1092,6 @@ class ExamPrepService:
             session.exam_type, topic_results, weaknesses,
         )
 
-        time_used = (now - session.started_at).total_seconds()
         time_limit = session.time_limit_minutes * 60.0
 
         result = ExamResult(
@@ -852,7 +1106,7 @@ class ExamPrepService:
             net_score=net_score,
             weighted_score=weighted_score,
             estimated_rank_percentile=estimated_percentile,
-            time_used_seconds=min(time_used, time_limit),
+            time_used_seconds=min(elapsed, time_limit),
             time_limit_seconds=time_limit,
             topic_results=topic_results,
             strengths=strengths,
@@ -861,9 +1115,12 @@ class ExamPrepService:
         )
 
         # Persist result
-        self._results[session_id] = result
-        user_key = f"{session.user_id}:{session.exam_type.value}"
-        self._user_results.setdefault(user_key, []).append(result)
+        self._remember(self._results, session_id, result)
+        user_key = (session.user_id, session.exam_type)
+        aggregate = self._user_aggregates.get(user_key)
+        if aggregate is None:
+            aggregate = self._user_aggregates[user_key] = _UserExamAggregate()
+        aggregate.add(result)
 
         logger.info(
             "Evaluated exam %s: %d/%d correct, net=%.2f, weighted=%.4f",
@@ -880,7 +1137,7 @@ class ExamPrepService:
         """Retrieve an exam session by ID, updating expired status."""
         session = self._sessions.get(session_id)
         if session is not None and session.status == ExamSessionStatus.ACTIVE:
-            if session.is_expired:
+            if self._is_expired(session):
                 session.status = ExamSessionStatus.EXPIRED
         return session
 
@@ -894,14 +1151,63 @@ class ExamPrepService:
     def get_remaining_time(self, session_id: str) -> float:
         """Return remaining seconds for an active session, or 0.0."""
         session = self._sessions.get(session_id)
-        if session is None:
+        if session is None or session.status != ExamSessionStatus.ACTIVE:
             return 0.0
-        return session.remaining_seconds
+        clock = self._session_clocks.get(session_id)
+        if clock is None:
+            return session.remaining_seconds
+        return max(clock[1] - time.monotonic(), 0.0)
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
+    @classmethod
+    def _remember(cls, store: "OrderedDict[str, Any]", key: str, value: Any) -> None:
+        """Insert into a bounded store, evicting the oldest entries."""
+        store[key] = value
+        store.move_to_end(key)
+        while len(store) > cls._MAX_SESSIONS:
+            store.popitem(last=False)
+
+    def _start_clock(self, session: ExamSession) -> None:
+        """Anchor the session's start and expiry on the monotonic clock."""
+        mono = time.monotonic()
+        now = datetime.utcnow()
+        self._remember(self._session_clocks, session.session_id, (
+            mono - (now - session.started_at).total_seconds(),
+            mono + (session.expires_at - now).total_seconds(),
+        ))
+
+    def _is_expired(self, session: ExamSession) -> bool:
+        """Whether *session* ran out of time, by the monotonic clock when known."""
+        clock = self._session_clocks.get(session.session_id)
+        if clock is None:
+            return session.is_expired
+        return time.monotonic() > clock[1]
+
+    def _elapsed_seconds(self, session: ExamSession, now: datetime) -> float:
+        """Seconds since *session* started, by the monotonic clock when known."""
+        clock = self._session_clocks.get(session.session_id)
+        if clock is None:
+            return (now - session.started_at).total_seconds()
+        return time.monotonic() - clock[0]
+
+    @staticmethod
+    def _topic_weights(exam_type: ExamType) -> List[TopicWeight]:
+        """
+        Return the shared topic weight list for *exam_type* without copying.
+
+        Internal callers only read it; ``get_topic_weights`` hands out copies.
+
+        Raises:
+            ValueError: If the exam type is unknown.
+        """
+        weights = _TOPIC_WEIGHTS_MAP.get(exam_type)
+        if weights is None:
+            raise ValueError(f"Unknown exam type: {exam_type}")
+        return weights
+
     @staticmethod
     def _build_weighted_distribution(
         topic_weights: List[TopicWeight],
@@ -914,32 +1220,38 @@ class ExamPrepService:
         to exactly *total_questions*.  Rounding residuals are distributed
         using the largest-remainder method.
         """
-        raw_counts = [
-            (tw, tw.weight * total_questions) for tw in topic_weights
+        quotas = [tw.weight * total_questions for tw in topic_weights]
+        # Weights are non-negative, so truncation is the floor
+        counts = [int(quota) for quota in quotas]
+        deficit = total_questions - sum(counts)
+
+        # Largest-remainder allocation for rounding residuals; only the
+        # top ``deficit`` topics are selected (ties keep declaration order)
+        for i in heapq.nlargest(
+            deficit, range(len(quotas)), key=lambda i: quotas[i] - counts[i],
+        ):
+            counts[i] += 1
+
+        return [
+            (tw, count) for tw, count in zip(topic_weights, counts) if count > 0
         ]
-        floor_counts = [
-            (tw, int(math.floor(count))) for tw, count in raw_counts
-        ]
-        remainders = [
-            (tw, count - int(math.floor(count)))
-            for tw, count in raw_counts
-        ]
-        allocated = sum(c for _, c in floor_counts)
-        deficit = total_questions - allocated
 
-        # Largest-remainder allocation for rounding residuals
-        remainders.sort(key=lambda x: x[1], reverse=True)
-        extra_slugs = {r[0].topic_slug for r in remainders[:deficit]}
-
-        distribution: List[tuple] = []
-        for tw, count in floor_counts:
-            final_count = count + (
-                1 if tw.topic_slug in extra_slugs else 0
-            )
-            if final_count > 0:
-                distribution.append((tw, final_count))
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _weighted_distribution(
+        exam_type: ExamType,
+        total_questions: int,
+    ) -> Tuple[tuple, ...]:
+        """
+        Memoised ``_build_weighted_distribution`` for an exam type's weights.
 
-        return distribution
+        Only a handful of ``(exam_type, total_questions)`` pairs occur in
+        practice (the mock exam sizes and common practice lengths), so the
+        allocation is computed once per pair and shared as an immutable tuple.
+        """
+        return tuple(ExamPrepService._build_weighted_distribution(
+            _TOPIC_WEIGHTS_MAP[exam_type], total_questions,
+        ))
 
     @staticmethod
     def _build_single_topic_distribution(
@@ -971,7 +1283,8 @@ class ExamPrepService:
         Falls back gracefully when a specific generator is not registered.
         """
         questions: List[ExamQuestion] = []
-        question_number = 1
+        grade_level = self._exam_type_to_grade(exam_type)
+        rand = self._rng.random
 
         for topic_weight, count in topic_distribution:
             generator = registry.get(topic_weight.question_type)
@@ -988,9 +1301,9 @@ class ExamPrepService:
                 continue
 
             diff_min, diff_max = topic_weight.difficulty_range
+            diff_span = diff_max - diff_min
             for _ in range(count):
-                difficulty = random.uniform(diff_min, diff_max)
-                grade_level = self._exam_type_to_grade(exam_type)
+                difficulty = diff_min + diff_span * rand()
 
                 try:
                     generated = generator.generate(
@@ -1013,16 +1326,16 @@ class ExamPrepService:
                         )
                         continue
 
-                questions.append(ExamQuestion(
-                    question_number=question_number,
-                    generated_question=generated,
-                    topic_slug=topic_weight.topic_slug,
-                    topic_name_tr=topic_weight.topic_name_tr,
+                # Numbered after the shuffle below
+                questions.append(ExamQuestion._fast_create(
+                    0,
+                    generated,
+                    topic_weight.topic_slug,
+                    topic_weight.topic_name_tr,
                 ))
-                question_number += 1
 
         # Shuffle so topics are interleaved (matches real exam feel)
-        random.shuffle(questions)
+        self._rng.shuffle(questions)
         for idx, q in enumerate(questions, start=1):
             q.question_number = idx
 
@@ -1031,11 +1344,7 @@ class ExamPrepService:
     @staticmethod
     def _exam_type_to_grade(exam_type: ExamType) -> int:
         """Map exam type to an approximate grade level for generators."""
-        return {
-            ExamType.LGS: 8,
-            ExamType.TYT: 10,
-            ExamType.AYT: 12,
-        }.get(exam_type, 8)
+        return _EXAM_GRADE.get(exam_type, 8)
 
     @staticmethod
     def _check_answer(
@@ -1048,40 +1357,7 @@ class ExamPrepService:
         Handles numeric tolerance, string normalisation, and fraction
         formats.
         """
-        correct = question.correct_answer
-
-        # Normalise both to strings for comparison
-        user_str = str(user_answer).strip().lower().replace(" ", "")
-        correct_str = str(correct).strip().lower().replace(" ", "")
-
-        # Exact string match
-        if user_str == correct_str:
-            return True
-
-        # Numeric comparison with tolerance
-        try:
-            user_num = float(user_str.replace(",", "."))
-            correct_num = float(correct_str.replace(",", "."))
-            if abs(user_num - correct_num) < 1e-6:
-                return True
-            # Percentage-based tolerance for larger numbers
-            if correct_num != 0 and abs(
-                (user_num - correct_num) / correct_num
-            ) < 0.005:
-                return True
-        except (ValueError, ZeroDivisionError):
-            pass
-
-        # Fraction comparison: e.g. "2/4" == "1/2"
-        try:
-            if "/" in user_str and "/" in correct_str:
-                from fractions import Fraction as Frac
-                if Frac(user_str) == Frac(correct_str):
-                    return True
-        except (ValueError, ZeroDivisionError):
-            pass
-
-        return False
+        return _answer_checker(str(question.correct_answer))(str(user_answer))
 
     @staticmethod
     def _estimate_percentile(
@@ -1105,9 +1381,7 @@ class ExamPrepService:
             normalised = max(0.0, net_score) / max_possible
 
         # Sigmoid-based rough percentile mapping
-        z = (normalised - 0.5) * 6
-        percentile = 100.0 / (1.0 + math.exp(-z))
-        return min(max(percentile, 0.0), 99.9)
+        return _sigmoid_percentile(normalised)
 
     @staticmethod
     def _generate_recommendations(
@@ -1123,77 +1397,48 @@ class ExamPrepService:
         """
         recommendations: List[str] = []
 
-        exam_labels = {
-            ExamType.LGS: "LGS",
-            ExamType.TYT: "TYT",
-            ExamType.AYT: "AYT",
-        }
-        exam_label = exam_labels.get(
+        exam_label = _EXAM_LABELS.get(
             exam_type, exam_type.value.upper()
         )
 
         if not weaknesses:
-            recommendations.append(
-                f"Tebrikler! {exam_label} konularinda genel "
-                f"performansiniz iyi. Daha da ilerlemek icin "
-                f"zorluk seviyesini artirmaya calisin."
-            )
+            recommendations.append(_REC_NO_WEAKNESS.format(exam=exam_label))
             return recommendations
 
-        # Sort by accuracy ascending so worst topics come first
-        sorted_topics = sorted(
-            topic_results, key=lambda t: t.accuracy
+        # Weak topics only, worst accuracy first
+        weak_slugs = frozenset(weaknesses)
+        weakest_first = heapq.nsmallest(
+            len(weak_slugs),
+            (tr for tr in topic_results if tr.topic_slug in weak_slugs),
+            key=operator.attrgetter("accuracy"),
         )
 
-        for tr in sorted_topics:
-            if tr.topic_slug not in weaknesses:
-                continue
-
-            pct = int(tr.accuracy * 100)
-            name = tr.topic_name_tr
-
+        for tr in weakest_first:
             if tr.accuracy < 0.25:
-                recommendations.append(
-                    f"{name} konusunda cok fazla calismaya "
-                    f"ihtiyaciniz var (%{pct} basari). Temel "
-                    f"kavramlari tekrar edin ve bol bol ornek "
-                    f"soru cozun."
-                )
+                template = _REC_VERY_WEAK
             elif tr.accuracy < 0.50:
-                recommendations.append(
-                    f"{name} konusunu guclendirmelisiniz "
-                    f"(%{pct} basari). Yanlis yaptiginiz "
-                    f"sorularin cozumlerini inceleyin ve "
-                    f"benzer sorularla pratik yapin."
-                )
+                template = _REC_WEAK
+            else:
+                continue
+            recommendations.append(template.format(
+                name=tr.topic_name_tr, pct=int(tr.accuracy * 100),
+            ))
 
-        # Time-management tip if applicable
-        slow_topics = [
-            tr for tr in topic_results
-            if tr.average_time_seconds > 120.0
-        ]
+        # Time-management tip if applicable (first three slow topics)
+        slow_topics = list(itertools.islice(
+            (tr for tr in topic_results if tr.average_time_seconds > 120.0),
+            3,
+        ))
         if slow_topics:
-            slow_names = ", ".join(
-                tr.topic_name_tr for tr in slow_topics[:3]
-            )
-            recommendations.append(
-                f"Zaman yonetimi: {slow_names} konularinda soru "
-                f"basina cok zaman harciyorsunuz. Hizli cozum "
-                f"teknikleri uzerinde calisin."
-            )
+            slow_names = ", ".join(tr.topic_name_tr for tr in slow_topics)
+            recommendations.append(_REC_SLOW_TOPICS.format(names=slow_names))
 
         # Exam-specific tips
         if exam_type == ExamType.LGS:
-            recommendations.append(
-                "LGS'de her soru esit puana sahiptir. "
-                "Emin olmadiginiz soruyu bos birakmak yerine "
-                "eleme yontemiyle cevap vermeye calisin."
-            )
+            recommendations.append(_REC_LGS_TIP)
         elif exam_type in (ExamType.TYT, ExamType.AYT):
             recommendations.append(
-                f"{exam_label}'de her yanlis 1/4 dogru puani "
-                f"goturur. Emin olmadiginiz sorulari bos "
-                f"birakmak daha avantajli olabilir."
+                _REC_NEGATIVE_MARKING_TIP.format(exam=exam_label)
             )
 
         return recommendations
@@ -17,6 +17,19 @@ from enum import Enum
 import re
 
 
+# Numbers inside an arithmetic expression
+_NUM_RE = re.compile(r'-?\d+(?:\.\d+)?')
+# Simple linear equation "ax + b = c" (spaces removed before matching)
+_LINEAR_EQ_RE = re.compile(r'(-?\d*)x\s*([+-])\s*(\d+)\s*=\s*(-?\d+)')
+# Operator symbols -> LaTeX commands, applied in a single pass
+_LATEX_TABLE = str.maketrans({
+    '×': '\\times',
+    '÷': '\\div',
+    '*': '\\times',
+    '/': '\\div',
+})
+
+
 class HintLevel(int, Enum):
     """Hint progression levels."""
     GENTLE = 1    # General strategy hint
@@ -24,16 +37,16 @@ class HintLevel(int, Enum):
     STRONG = 3    # Nearly gives the approach
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Hint:
-    """A single hint."""
+    """A single hint (immutable; shared from the module-level tables)."""
     level: HintLevel
     text: str
     text_tr: str  # Turkish translation
     xp_cost: int  # XP penalty for using hint
 
 
-@dataclass
+@dataclass(slots=True)
 class SolutionStep:
     """A single step in the solution."""
     step_number: int
@@ -45,7 +58,7 @@ class SolutionStep:
     explanation_tr: str
 
 
-@dataclass
+@dataclass(slots=True)
 class FullSolution:
     """Complete step-by-step solution."""
     question_id: str
@@ -55,17 +68,134 @@ class FullSolution:
     total_steps: int
 
 
+# XP costs for hints
+_HINT_COSTS: Dict[HintLevel, int] = {
+    HintLevel.GENTLE: 5,
+    HintLevel.MODERATE: 10,
+    HintLevel.STRONG: 20,
+}
+
+
+def _hint_set(
+    gentle: Tuple[str, str],
+    moderate: Tuple[str, str],
+    strong: Tuple[str, str],
+) -> Tuple[Hint, ...]:
+    """Build a gentle/moderate/strong hint set from (English, Turkish) pairs."""
+    return (
+        Hint(HintLevel.GENTLE, *gentle, _HINT_COSTS[HintLevel.GENTLE]),
+        Hint(HintLevel.MODERATE, *moderate, _HINT_COSTS[HintLevel.MODERATE]),
+        Hint(HintLevel.STRONG, *strong, _HINT_COSTS[HintLevel.STRONG]),
+    )
+
+
+# Static hint sets, built once at import
+_ARITHMETIC_HINTS: Dict[str, Tuple[Hint, ...]] = {
+    "add": _hint_set(
+        ("Think about combining quantities together.",
+         "Miktarlari birlestirmeyi dusun."),
+        ("Start from the ones place and work left. Carry over if needed.",
+         "Birler basamagindan basla ve sola dogru ilerle. Gerekirse elde var."),
+        ("Add each column: ones, tens, hundreds. Remember to carry!",
+         "Her sutunu topla: birler, onlar, yuzler. Eldeyi unutma!"),
+    ),
+    "subtract": _hint_set(
+        ("Think about taking away or finding the difference.",
+         "Cikartmayi veya farki bulmavi dusun."),
+        ("Start from the right. If the top digit is smaller, borrow from the left.",
+         "Sagdan basla. Ustteki rakam kucukse, soldan odunc al."),
+        ("Borrow from the tens place when needed. Subtract each column.",
+         "Gerektiginde onlar basamagindan odunc al. Her sutunu cikar."),
+    ),
+    "multiply": _hint_set(
+        ("Think about repeated addition or groups of numbers.",
+         "Tekrarli toplama veya sayi gruplarini dusun."),
+        ("Multiply each digit separately, then add the partial products.",
+         "Her rakami ayri ayri carp, sonra kismi carpimlari topla."),
+        ("Use the standard algorithm: multiply, carry, then add rows.",
+         "Standart algoritmavi kullan: carp, elde, sonra satirlari topla."),
+    ),
+    "divide": _hint_set(
+        ("Think about splitting into equal groups.",
+         "Esit gruplara bolmeyi dusun."),
+        ("How many times does the divisor fit into the dividend?",
+         "Bolen, bolunenin icine kac kez sigar?"),
+        ("Use long division: divide, multiply, subtract, bring down.",
+         "Uzun bolme kullan: bol, carp, cikar, asagi indir."),
+    ),
+}
+
+_ALGEBRA_HINTS = _hint_set(
+    ("Isolate the variable on one side of the equation.",
+     "Degiskeni denklemin bir tarafinda yalniz birak."),
+    ("Do the same operation to both sides to keep the equation balanced.",
+     "Denklemi dengede tutmak icin her iki tarafa ayni islemi yap."),
+    ("First add/subtract to move constants, then divide by the coefficient.",
+     "Once sabitleri tasimak icin topla/cikar, sonra katsayiya bol."),
+)
+
+_FRACTION_HINTS = _hint_set(
+    ("Remember: a fraction has a numerator (top) and denominator (bottom).",
+     "Unutma: Kesirin pavi (ust) ve paydasi (alt) vardir."),
+    ("For addition/subtraction, find a common denominator first.",
+     "Toplama/cikarma icin once ortak payda bul."),
+    ("Multiply numerator × numerator and denominator × denominator for multiplication.",
+     "Carpma icin pay × pay ve payda × payda carp."),
+)
+
+_PERCENTAGE_HINTS = _hint_set(
+    ("Percent means 'per hundred' or 'out of 100'.",
+     "Yuzde 'yuz ustunden' veya '100'de' demektir."),
+    ("To find X% of a number, multiply by X/100.",
+     "Bir sayinin %X'ini bulmak icin X/100 ile carp."),
+    ("Convert percentage to decimal (divide by 100), then multiply.",
+     "Yuzdeyi ondaliga cevir (100'e bol), sonra carp."),
+)
+
+_GEOMETRY_AREA_HINTS = _hint_set(
+    ("Area is the space inside a shape, measured in square units.",
+     "Alan, seklin icindeki bosluktur, kare birimlerle olculur."),
+    ("Rectangle area = length × width. Circle area = π × r².",
+     "Dikdortgen alani = uzunluk × genislik. Daire alani = π × r²."),
+    ("Plug the given measurements into the area formula.",
+     "Verilen olculeri alan formulune yerlestir."),
+)
+
+_GEOMETRY_PERIMETER_HINTS = _hint_set(
+    ("Perimeter is the distance around the outside of a shape.",
+     "Cevre, seklin dis kenarlarinin toplam uzunlugudur."),
+    ("Add up all the sides of the shape.",
+     "Seklin tum kenarlarini topla."),
+    ("Rectangle perimeter = 2 × (length + width).",
+     "Dikdortgen cevresi = 2 × (uzunluk + genislik)."),
+)
+
+_RATIO_HINTS = _hint_set(
+    ("A ratio compares two quantities. Think about the relationship.",
+     "Oran iki miktari karsilastirir. Iliskiyi dusun."),
+    ("Set up a proportion: a/b = c/d, then cross-multiply.",
+     "Oranli kurulum yap: a/b = c/d, sonra capraz carp."),
+    ("Cross-multiply and solve: a × d = b × c.",
+     "Capraz carp ve coz: a × d = b × c."),
+)
+
+_GENERIC_HINTS = _hint_set(
+    ("Read the problem carefully and identify what you need to find.",
+     "Problemi dikkatli oku ve ne bulman gerektigini belirle."),
+    ("Write down the given information and the formula you need.",
+     "Verilen bilgileri ve gereken formulu yaz."),
+    ("Substitute the values into the formula and calculate step by step.",
+     "Degerleri formule yerlestir ve adim adim hesapla."),
+)
+
+
 class HintService:
     """
     Generates hints and solutions for math questions.
     """
 
     # XP costs for hints
-    HINT_COSTS = {
-        HintLevel.GENTLE: 5,
-        HintLevel.MODERATE: 10,
-        HintLevel.STRONG: 20,
-    }
+    HINT_COSTS = _HINT_COSTS
 
     def get_hints(
         self,
@@ -86,24 +216,10 @@ class HintService:
         Returns:
             List of 3 hints from gentle to strong
         """
-        hints = []
-
-        if question_type == "arithmetic":
-            hints = self._arithmetic_hints(operation, expression)
-        elif question_type == "algebra":
-            hints = self._algebra_hints(expression)
-        elif question_type == "fractions":
-            hints = self._fraction_hints(operation, expression)
-        elif question_type == "percentages":
-            hints = self._percentage_hints(expression)
-        elif question_type == "geometry":
-            hints = self._geometry_hints(operation, expression)
-        elif question_type == "ratios":
-            hints = self._ratio_hints(expression)
-        else:
-            hints = self._generic_hints()
-
-        return hints
+        generate = self._HINT_DISPATCH.get(question_type)
+        if generate is None:
+            return self._generic_hints()
+        return generate(self, operation, expression)
 
     def get_solution_steps(
         self,
@@ -126,22 +242,11 @@ class HintService:
         Returns:
             FullSolution with all steps
         """
-        steps = []
-
-        if question_type == "arithmetic":
-            steps = self._arithmetic_steps(operation, expression, correct_answer, params)
-        elif question_type == "algebra":
-            steps = self._algebra_steps(expression, correct_answer, params)
-        elif question_type == "fractions":
-            steps = self._fraction_steps(operation, expression, correct_answer, params)
-        elif question_type == "percentages":
-            steps = self._percentage_steps(expression, correct_answer, params)
-        elif question_type == "geometry":
-            steps = self._geometry_steps(operation, expression, correct_answer, params)
-        elif question_type == "ratios":
-            steps = self._ratio_steps(expression, correct_answer, params)
-        else:
+        generate = self._STEPS_DISPATCH.get(question_type)
+        if generate is None:
             steps = self._generic_steps(expression, correct_answer)
+        else:
+            steps = generate(self, operation, expression, correct_answer, params)
 
         return FullSolution(
             question_id="",
@@ -155,68 +260,10 @@ class HintService:
 
     def _arithmetic_hints(self, operation: str, expression: str) -> List[Hint]:
         """Generate hints for arithmetic questions."""
-        if operation == "add":
-            return [
-                Hint(HintLevel.GENTLE,
-                     "Think about combining quantities together.",
-                     "Miktarlari birlestirmeyi dusun.",
-                     self.HINT_COSTS[HintLevel.GENTLE]),
-                Hint(HintLevel.MODERATE,
-                     "Start from the ones place and work left. Carry over if needed.",
-                     "Birler basamagindan basla ve sola dogru ilerle. Gerekirse elde var.",
-                     self.HINT_COSTS[HintLevel.MODERATE]),
-                Hint(HintLevel.STRONG,
-                     "Add each column: ones, tens, hundreds. Remember to carry!",
-                     "Her sutunu topla: birler, onlar, yuzler. Eldeyi unutma!",
-                     self.HINT_COSTS[HintLevel.STRONG]),
-            ]
-        elif operation == "subtract":
-            return [
-                Hint(HintLevel.GENTLE,
-                     "Think about taking away or finding the difference.",
-                     "Cikartmayi veya farki bulmavi dusun.",
-                     self.HINT_COSTS[HintLevel.GENTLE]),
-                Hint(HintLevel.MODERATE,
-                     "Start from the right. If the top digit is smaller, borrow from the left.",
-                     "Sagdan basla. Ustteki rakam kucukse, soldan odunc al.",
-                     self.HINT_COSTS[HintLevel.MODERATE]),
-                Hint(HintLevel.STRONG,
-                     "Borrow from the tens place when needed. Subtract each column.",
-                     "Gerektiginde onlar basamagindan odunc al. Her sutunu cikar.",
-                     self.HINT_COSTS[HintLevel.STRONG]),
-            ]
-        elif operation == "multiply":
-            return [
-                Hint(HintLevel.GENTLE,
-                     "Think about repeated addition or groups of numbers.",
-                     "Tekrarli toplama veya sayi gruplarini dusun.",
-                     self.HINT_COSTS[HintLevel.GENTLE]),
-                Hint(HintLevel.MODERATE,
-                     "Multiply each digit separately, then add the partial products.",
-                     "Her rakami ayri ayri carp, sonra kismi carpimlari topla.",
-                     self.HINT_COSTS[HintLevel.MODERATE]),
-                Hint(HintLevel.STRONG,
-                     "Use the standard algorithm: multiply, carry, then add rows.",
-                     "Standart algoritmavi kullan: carp, elde, sonra satirlari topla.",
-                     self.HINT_COSTS[HintLevel.STRONG]),
-            ]
-        elif operation == "divide":
-            return [
-                Hint(HintLevel.GENTLE,
-                     "Think about splitting into equal groups.",
-                     "Esit gruplara bolmeyi dusun.",
-                     self.HINT_COSTS[HintLevel.GENTLE]),
-                Hint(HintLevel.MODERATE,
-                     "How many times does the divisor fit into the dividend?",
-                     "Bolen, bolunenin icine kac kez sigar?",
-                     self.HINT_COSTS[HintLevel.MODERATE]),
-                Hint(HintLevel.STRONG,
-                     "Use long division: divide, multiply, subtract, bring down.",
-                     "Uzun bolme kullan: bol, carp, cikar, asagi indir.",
-                     self.HINT_COSTS[HintLevel.STRONG]),
-            ]
-        else:
+        hints = _ARITHMETIC_HINTS.get(operation)
+        if hints is None:
             return self._generic_hints()
+        return list(hints)
 
     def _arithmetic_steps(
         self,
@@ -229,7 +276,7 @@ class HintService:
         steps = []
 
         # Parse expression to get numbers
-        numbers = re.findall(r'-?\d+\.?\d*', expression)
+        numbers = _NUM_RE.findall(expression)
         if len(numbers) < 2:
             return self._generic_steps(expression, answer)
 
@@ -325,25 +372,13 @@ class HintService:
 
     # ==================== ALGEBRA ====================
 
-    def _algebra_hints(self, expression: str) -> List[Hint]:
+    def _algebra_hints(self, operation: Optional[str], expression: str) -> List[Hint]:
         """Generate hints for algebra questions."""
-        return [
-            Hint(HintLevel.GENTLE,
-                 "Isolate the variable on one side of the equation.",
-                 "Degiskeni denklemin bir tarafinda yalniz birak.",
-                 self.HINT_COSTS[HintLevel.GENTLE]),
-            Hint(HintLevel.MODERATE,
-                 "Do the same operation to both sides to keep the equation balanced.",
-                 "Denklemi dengede tutmak icin her iki tarafa ayni islemi yap.",
-                 self.HINT_COSTS[HintLevel.MODERATE]),
-            Hint(HintLevel.STRONG,
-                 "First add/subtract to move constants, then divide by the coefficient.",
-                 "Once sabitleri tasimak icin topla/cikar, sonra katsayiya bol.",
-                 self.HINT_COSTS[HintLevel.STRONG]),
-        ]
+        return list(_ALGEBRA_HINTS)
 
     def _algebra_steps(
         self,
+        operation: Optional[str],
         expression: str,
         answer: str,
         params: Optional[Dict]
@@ -353,7 +388,7 @@ class HintService:
         steps = []
 
         # Try to parse ax + b = c format
-        match = re.match(r'(-?\d*)x\s*([+-])\s*(\d+)\s*=\s*(-?\d+)', expression.replace(' ', ''))
+        match = _LINEAR_EQ_RE.match(expression.replace(' ', ''))
         if match:
             a = int(match.group(1)) if match.group(1) and match.group(1) != '-' else (
                 -1 if match.group(1) == '-' else 1)
@@ -409,20 +444,7 @@ class HintService:
 
     def _fraction_hints(self, operation: str, expression: str) -> List[Hint]:
         """Generate hints for fraction questions."""
-        return [
-            Hint(HintLevel.GENTLE,
-                 "Remember: a fraction has a numerator (top) and denominator (bottom).",
-                 "Unutma: Kesirin pavi (ust) ve paydasi (alt) vardir.",
-                 self.HINT_COSTS[HintLevel.GENTLE]),
-            Hint(HintLevel.MODERATE,
-                 "For addition/subtraction, find a common denominator first.",
-                 "Toplama/cikarma icin once ortak payda bul.",
-                 self.HINT_COSTS[HintLevel.MODERATE]),
-            Hint(HintLevel.STRONG,
-                 "Multiply numerator × numerator and denominator × denominator for multiplication.",
-                 "Carpma icin pay × pay ve payda × payda carp.",
-                 self.HINT_COSTS[HintLevel.STRONG]),
-        ]
+        return list(_FRACTION_HINTS)
 
     def _fraction_steps(
         self,
@@ -436,25 +458,13 @@ class HintService:
 
     # ==================== PERCENTAGES ====================
 
-    def _percentage_hints(self, expression: str) -> List[Hint]:
+    def _percentage_hints(self, operation: Optional[str], expression: str) -> List[Hint]:
         """Generate hints for percentage questions."""
-        return [
-            Hint(HintLevel.GENTLE,
-                 "Percent means 'per hundred' or 'out of 100'.",
-                 "Yuzde 'yuz ustunden' veya '100'de' demektir.",
-                 self.HINT_COSTS[HintLevel.GENTLE]),
-            Hint(HintLevel.MODERATE,
-                 "To find X% of a number, multiply by X/100.",
-                 "Bir sayinin %X'ini bulmak icin X/100 ile carp.",
-                 self.HINT_COSTS[HintLevel.MODERATE]),
-            Hint(HintLevel.STRONG,
-                 "Convert percentage to decimal (divide by 100), then multiply.",
-                 "Yuzdeyi ondaliga cevir (100'e bol), sonra carp.",
-                 self.HINT_COSTS[HintLevel.STRONG]),
-        ]
+        return list(_PERCENTAGE_HINTS)
 
     def _percentage_steps(
         self,
+        operation: Optional[str],
         expression: str,
         answer: str,
         params: Optional[Dict]
@@ -467,35 +477,8 @@ class HintService:
     def _geometry_hints(self, operation: str, expression: str) -> List[Hint]:
         """Generate hints for geometry questions."""
         if "area" in operation.lower() or "alan" in expression.lower():
-            return [
-                Hint(HintLevel.GENTLE,
-                     "Area is the space inside a shape, measured in square units.",
-                     "Alan, seklin icindeki bosluktur, kare birimlerle olculur.",
-                     self.HINT_COSTS[HintLevel.GENTLE]),
-                Hint(HintLevel.MODERATE,
-                     "Rectangle area = length × width. Circle area = π × r².",
-                     "Dikdortgen alani = uzunluk × genislik. Daire alani = π × r².",
-                     self.HINT_COSTS[HintLevel.MODERATE]),
-                Hint(HintLevel.STRONG,
-                     "Plug the given measurements into the area formula.",
-                     "Verilen olculeri alan formulune yerlestir.",
-                     self.HINT_COSTS[HintLevel.STRONG]),
-            ]
-        else:  # perimeter
-            return [
-                Hint(HintLevel.GENTLE,
-                     "Perimeter is the distance around the outside of a shape.",
-                     "Cevre, seklin dis kenarlarinin toplam uzunlugudur.",
-                     self.HINT_COSTS[HintLevel.GENTLE]),
-                Hint(HintLevel.MODERATE,
-                     "Add up all the sides of the shape.",
-                     "Seklin tum kenarlarini topla.",
-                     self.HINT_COSTS[HintLevel.MODERATE]),
-                Hint(HintLevel.STRONG,
-                     "Rectangle perimeter = 2 × (length + width).",
-                     "Dikdortgen cevresi = 2 × (uzunluk + genislik).",
-                     self.HINT_COSTS[HintLevel.STRONG]),
-            ]
+            return list(_GEOMETRY_AREA_HINTS)
+        return list(_GEOMETRY_PERIMETER_HINTS)  # perimeter
 
     def _geometry_steps(
         self,
@@ -509,25 +492,13 @@ class HintService:
 
     # ==================== RATIOS ====================
 
-    def _ratio_hints(self, expression: str) -> List[Hint]:
+    def _ratio_hints(self, operation: Optional[str], expression: str) -> List[Hint]:
         """Generate hints for ratio questions."""
-        return [
-            Hint(HintLevel.GENTLE,
-                 "A ratio compares two quantities. Think about the relationship.",
-                 "Oran iki miktari karsilastirir. Iliskiyi dusun.",
-                 self.HINT_COSTS[HintLevel.GENTLE]),
-            Hint(HintLevel.MODERATE,
-                 "Set up a proportion: a/b = c/d, then cross-multiply.",
-                 "Oranli kurulum yap: a/b = c/d, sonra capraz carp.",
-                 self.HINT_COSTS[HintLevel.MODERATE]),
-            Hint(HintLevel.STRONG,
-                 "Cross-multiply and solve: a × d = b × c.",
-                 "Capraz carp ve coz: a × d = b × c.",
-                 self.HINT_COSTS[HintLevel.STRONG]),
-        ]
+        return list(_RATIO_HINTS)
 
     def _ratio_steps(
         self,
+        operation: Optional[str],
         expression: str,
         answer: str,
         params: Optional[Dict]
@@ -539,20 +510,7 @@ class HintService:
 
     def _generic_hints(self) -> List[Hint]:
         """Generic hints for any question type."""
-        return [
-            Hint(HintLevel.GENTLE,
-                 "Read the problem carefully and identify what you need to find.",
-                 "Problemi dikkatli oku ve ne bulman gerektigini belirle.",
-                 self.HINT_COSTS[HintLevel.GENTLE]),
-            Hint(HintLevel.MODERATE,
-                 "Write down the given information and the formula you need.",
-                 "Verilen bilgileri ve gereken formulu yaz.",
-                 self.HINT_COSTS[HintLevel.MODERATE]),
-            Hint(HintLevel.STRONG,
-                 "Substitute the values into the formula and calculate step by step.",
-                 "Degerleri formule yerlestir ve adim adim hesapla.",
-                 self.HINT_COSTS[HintLevel.STRONG]),
-        ]
+        return list(_GENERIC_HINTS)
 
     def _generic_steps(self, expression: str, answer: str) -> List[SolutionStep]:
         """Generic solution steps."""
@@ -579,11 +537,27 @@ class HintService:
 
     def _to_latex(self, text: str) -> str:
         """Convert expression to LaTeX format."""
-        return (text
-                .replace('×', '\\times')
-                .replace('÷', '\\div')
-                .replace('*', '\\times')
-                .replace('/', '\\div'))
+        return text.translate(_LATEX_TABLE)
+
+    # question_type -> generator; every entry takes
+    # (self, operation, expression) for hints and
+    # (self, operation, expression, answer, params) for steps
+    _HINT_DISPATCH = {
+        "arithmetic": _arithmetic_hints,
+        "algebra": _algebra_hints,
+        "fractions": _fraction_hints,
+        "percentages": _percentage_hints,
+        "geometry": _geometry_hints,
+        "ratios": _ratio_hints,
+    }
+    _STEPS_DISPATCH = {
+        "arithmetic": _arithmetic_steps,
+        "algebra": _algebra_steps,
+        "fractions": _fraction_steps,
+        "percentages": _percentage_steps,
+        "geometry": _geometry_steps,
+        "ratios": _ratio_steps,
+    }
 
 
 # Global instance
@@ -381,3 +381,218 @@ class TestEMACalculationService:
 
         mastery = tracker.get_mastery("topic1")
         assert mastery > 0.9  # Should be high after 10 correct
+
+
+class TestDiagnosticService:
+    """Tests for the adaptive diagnostic placement service."""
+
+    def test_placement_result_aggregates(self):
+        """Test that placement aggregates match the per-topic assessments."""
+        from backend.services.diagnostic_service import DiagnosticService
+
+        service = DiagnosticService()
+        session = service.start_diagnostic(user_id="u1", grade_level=7)
+
+        answer_correctly = True
+        while True:
+            question = service.get_next_question(session.session_id)
+            if question is None:
+                break
+            answer = question.correct_answer if answer_correctly else "__wrong__"
+            service.submit_answer(session.session_id, question.question_id, answer)
+            answer_correctly = not answer_correctly
+
+        result = service.complete_diagnostic(session.session_id)
+        assessed = [
+            a for a in session.topic_assessments.values() if a.questions_asked > 0
+        ]
+
+        assert result.total_questions == session.total_questions_asked
+        assert result.total_correct == sum(a.questions_correct for a in assessed)
+        expected_mastery = sum(a.mastery_score for a in assessed) / len(assessed)
+        assert abs(result.overall_mastery - expected_mastery) < 1e-9
+
+        scores = {a.topic.value: a.mastery_score for a in assessed}
+        focus_scores = [scores[t] for t in result.focus_topics]
+        assert focus_scores == sorted(focus_scores)
+        assert all(score < 0.60 for score in focus_scores)
+
+
+class TestClassAnalyticsService:
+    """Tests for the class analytics dashboard service."""
+
+    def test_snapshot_refreshes_on_new_activity(self):
+        """Test that cached class analytics pick up newly written activity."""
+        from datetime import datetime
+        from backend.services.enhanced_parent_teacher_service import (
+            ClassAnalyticsService, _DataStore,
+        )
+
+        store = _DataStore()
+        store.add_student_to_class("c1", "s1")
+        store.add_student_to_class("c1", "s2")
+        service = ClassAnalyticsService(store)
+
+        assert service.get_class_overview("c1")["ortalama_soru_sayisi"] == 0.0
+        assert len(service.get_at_risk_students("c1")) == 2
+
+        store.append_activity("s1", {
+            "topic": "Cebir", "questions_answered": 10, "correct_answers": 9,
+            "duration_minutes": 15, "timestamp": datetime.utcnow(),
+        })
+        assert store.get_student_aggregate("s1") == store.recompute_student_aggregate("s1")
+
+        overview = service.get_class_overview("c1")
+        assert overview["ortalama_soru_sayisi"] == 5.0
+        assert overview["basari_dagilimi"]["cok_iyi"] == 1
+        topics = service.get_topic_analysis("c1")
+        assert topics == [{
+            "topic": "Cebir", "toplam_soru": 10, "dogruluk_orani": 90.0,
+            "katilan_ogrenci": 1, "ogrenci_orani": 50.0,
+        }]
+        at_risk = {s["student_id"]: s for s in service.get_at_risk_students("c1")}
+        assert "Hic aktivite yok" not in at_risk["s1"]["risk_faktorleri"]
+        assert "Hic aktivite yok" in at_risk["s2"]["risk_faktorleri"]
+
+        # Activity without a timestamp counts overall but not for the week
+        store.append_activity("s2", {"topic": "Cebir", "questions_answered": 10})
+        at_risk = {s["student_id"]: s for s in service.get_at_risk_students("c1")}
+        assert at_risk["s2"]["haftalik_soru"] == 0
+        assert "Hic aktivite yok" not in at_risk["s2"]["risk_faktorleri"]
+
+
+class TestHomeworkService:
+    """Tests for the teacher homework service."""
+
+    def test_grading_state_stays_off_api_objects(self):
+        """Test that homework responses only carry their public fields."""
+        from dataclasses import asdict
+        from datetime import datetime, timedelta
+        from backend.services.enhanced_parent_teacher_service import (
+            HomeworkService, _DataStore,
+        )
+
+        store = _DataStore()
+        store.add_student_to_class("c1", "s1")
+        store.add_student_to_class("c1", "s2")
+        service = HomeworkService(store)
+        homework = service.create_homework(
+            "t1", "c1", ["Cebir", "Geometri"], 4,
+            datetime.utcnow() + timedelta(hours=5), "Odev",
+        )
+        answers = [{"question_id": q["question_id"], "answer": "A"}
+                   for q in homework.questions[:3]]
+        submission = service.submit_homework(homework.homework_id, "s1", answers)
+        service.grade_homework(homework.homework_id)
+
+        assert set(asdict(homework)) == {
+            "homework_id", "teacher_id", "class_id", "title", "topics",
+            "question_count", "questions", "due_date", "created_at", "status",
+            "sinif_ortalamasi", "teslim_sayisi", "toplam_ogrenci",
+        }
+        assert "answer_list" not in asdict(submission)
+        assert (submission.score, submission.bos_sayisi) == (75.0, 1)
+        assert submission.topic_scores == {"Cebir": 100.0, "Geometri": 50.0}
+
+        assert service.get_student_homework_list("s1")["tamamlanan"][0]["score"] == 75.0
+        pending = service.get_student_homework_list("s2")["bekleyen"]
+        assert pending[0]["kalan_sure_saat"] == 5.0
+
+
+class TestWeeklyReportService:
+    """Tests for the weekly parent report service."""
+
+    def test_out_of_order_and_untimestamped_activity(self):
+        """Test that weekly windows hold regardless of activity write order."""
+        from datetime import datetime, timedelta
+        from backend.services.enhanced_parent_teacher_service import (
+            WeeklyReportService, _DataStore,
+        )
+
+        now = datetime.utcnow()
+        store = _DataStore()
+        for days_ago, questions in ((1, 10), (9, 5), (None, 7), (3, 10), (20, 4)):
+            activity = {"topic": "Cebir", "questions_answered": questions,
+                        "correct_answers": questions, "duration_minutes": 10}
+            if days_ago is not None:
+                activity["timestamp"] = now - timedelta(days=days_ago)
+            store.append_activity("s1", activity)
+
+        assert len(store.get_student_activity("s1")) == 5
+        week = store.get_student_activity("s1", since=now - timedelta(days=7))
+        assert [a.questions_answered for a in week] == [10, 10]
+        assert store.get_rolling_aggregates("s1", now).questions == 20
+
+        report = WeeklyReportService(store).generate_weekly_report("s1")
+        assert report.toplam_soru == 20
+        assert report.soru_degisim_yuzdesi == 300.0
+
+
+class TestExamPrepService:
+    """Tests for the exam preparation service."""
+
+    def test_statistics_survive_session_eviction(self, monkeypatch):
+        """Test that bounded stores keep per-user statistics intact."""
+        from backend.services.exam_prep_service import ExamPrepService, ExamType
+
+        monkeypatch.setattr(ExamPrepService, "_MAX_SESSIONS", 2)
+        service = ExamPrepService()
+
+        results = []
+        for _ in range(4):
+            session = service.generate_exam_session(
+                user_id="evict-user", exam_type=ExamType.LGS,
+                topic_slug="cebir", question_count=4,
+            )
+            answers = {
+                q.question_number: q.generated_question.correct_answer
+                for q in session.questions[:2]
+            }
+            results.append(service.evaluate_exam(session.session_id, answers))
+
+        assert len(ExamPrepService._sessions) <= 2
+        assert list(ExamPrepService._session_clocks) == list(ExamPrepService._sessions)
+        assert service.get_session(results[0].session_id) is None
+
+        stats = service.get_exam_statistics("evict-user", ExamType.LGS)
+        assert stats.total_sessions == 4
+        assert stats.total_questions_answered == 8
+        assert stats.score_trend == [r.net_score for r in results]
+
+        for user_id in ("other-user-1", "other-user-2"):
+            session = service.generate_exam_session(
+                user_id=user_id, exam_type=ExamType.LGS,
+                topic_slug="cebir", question_count=4,
+            )
+            service.evaluate_exam(session.session_id, {})
+        assert len(ExamPrepService._results) <= 2
+        assert results[-1].session_id not in ExamPrepService._results
+
+        stats = service.get_exam_statistics("evict-user", ExamType.LGS)
+        assert stats.total_sessions == 4
+        assert stats.score_trend == [r.net_score for r in results]
+
+    def test_session_serialises_public_fields_only(self):
+        """Test that evaluated sessions expose only their public state."""
+        from dataclasses import asdict
+        from backend.services.exam_prep_service import ExamPrepService, ExamType
+
+        service = ExamPrepService()
+        session = service.generate_exam_session(
+            user_id="serialise-user", exam_type=ExamType.LGS,
+            topic_slug="cebir", question_count=4,
+        )
+        first = session.questions[0]
+        service.evaluate_exam(session.session_id, {
+            first.question_number: first.generated_question.correct_answer,
+        })
+
+        assert set(asdict(session)) == {
+            "session_id", "user_id", "exam_type", "session_type", "status",
+            "questions", "total_questions", "time_limit_minutes",
+            "started_at", "expires_at", "completed_at",
+        }
+        data = session.to_dict()
+        assert (data["answered_count"], data["correct_count"]) == (1, 1)
+        assert data["accuracy"] == 1.0
+        assert data["remaining_seconds"] == 0.0